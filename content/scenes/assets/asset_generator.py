@@ -179,28 +179,30 @@ def _tab_image(comfy, comfy_ok):
         save_dir = Path(project_root) / "content" / "simulation" / "media" / "images"
         save_dir.mkdir(parents=True, exist_ok=True)
 
-        for i in range(int(num_images)):
-            with st.spinner(f"Generating image {i+1}/{int(num_images)}..."):
-                try:
-                    # Enrich prompt with mood/setting
-                    extra = ""
-                    if mood != "none":
-                        extra += f", {mood} expression"
-                    if setting != "none":
-                        extra += f", {setting} setting"
-
-                    path = comfy.generate_image(
-                        positive_prompt=pos_prompt + extra,
-                        negative_prompt=neg_prompt,
-                        save_dir=str(save_dir),
-                    )
-                    if path:
-                        st.image(path, caption=f"Image {i+1}", use_column_width=True)
-                        st.success(f"✅ Saved to {path}")
-                    else:
-                        st.error(f"Generation failed for image {i+1}")
-                except Exception as e:
-                    st.error(f"Error: {e}")
+        # Enrich prompt with mood/setting
+        extra = ""
+        if mood != "none":
+            extra += f", {mood} expression"
+        if setting != "none":
+            extra += f", {setting} setting"
+
+        count = int(num_images)
+        with st.spinner(f"Generating {count} image(s)..."):
+            try:
+                paths = comfy.generate_batch(
+                    [(pos_prompt + extra, neg_prompt)] * count,
+                    save_dir=str(save_dir),
+                )
+            except Exception as e:
+                st.error(f"Error: {e}")
+                paths = []
+
+        for i, path in enumerate(paths):
+            if path:
+                st.image(path, caption=f"Image {i+1}", use_column_width=True)
+                st.success(f"✅ Saved to {path}")
+            else:
+                st.error(f"Generation failed for image {i+1}")
 
 
 # ── Tab: Video ────────────────────────────────────────────────────────────────
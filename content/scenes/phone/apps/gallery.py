@@ -3,9 +3,15 @@ Gallery App - Photo and video gallery
 """
 
 import os
+import random
+import time
+import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
+
+# Seconds a character's candidate media ids are reused by random_media_id()
+MEDIA_ID_CACHE_TTL = 60
 
 
 class Gallery:
@@ -20,6 +26,9 @@ class Gallery:
             self.media_dir = Path(media_dir)
         
         self.media_dir.mkdir(exist_ok=True)
+        
+        # (character_id, media_type, limit) -> (expires_at, ids)
+        self._media_ids: Dict[Tuple[str, str, int], Tuple[float, List[str]]] = {}
     
     def add_media(
         self,
@@ -27,7 +36,8 @@ class Gallery:
         filepath: str,
         media_type: str = "image",
         thumbnail: str = None,
-        metadata: Dict = None
+        metadata: Dict = None,
+        content_hash: str = None
     ) -> str:
         """
         Add media to gallery
@@ -38,6 +48,7 @@ class Gallery:
             media_type: 'image' or 'video'
             thumbnail: Path to thumbnail
             metadata: Additional metadata
+            content_hash: Hex digest of the file contents (for deduplication)
         
         Returns:
             Media ID
@@ -46,23 +57,28 @@ class Gallery:
         if not Path(filepath).exists():
             raise FileNotFoundError(f"Media file not found: {filepath}")
         
+        media_id = str(uuid.uuid4())
+        
         # Insert into database
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
-                INSERT INTO media (character_id, type, filepath, thumbnail, metadata)
-                VALUES (?, ?, ?, ?, ?)
+                INSERT INTO media (id, character_id, type, filepath, thumbnail, metadata, created_at, hash)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
             """, (
+                media_id,
                 character_id,
                 media_type,
                 filepath,
                 thumbnail,
-                str(metadata) if metadata else None
+                str(metadata) if metadata else None,
+                datetime.now().isoformat(),
+                content_hash
             ))
             conn.commit()
-            media_id = cursor.lastrowid
         
-        return str(media_id)
+        self._invalidate_media_ids(character_id)
+        return media_id
     
     def get_media(self, media_id: str) -> Optional[Dict]:
         """Get media by ID"""
@@ -88,6 +104,51 @@ class Gallery:
         
         return None
     
+    def get_by_hash(self, content_hash: str, character_id: str) -> Optional[Dict]:
+        """Get a character's media item with the given content hash"""
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT id, character_id, type, filepath, thumbnail, created_at, metadata
+                FROM media
+                WHERE character_id = ? AND hash = ?
+            """, (character_id, content_hash))
+            
+            row = cursor.fetchone()
+            if row:
+                return {
+                    'id': row[0],
+                    'character_id': row[1],
+                    'type': row[2],
+                    'filepath': row[3],
+                    'thumbnail': row[4],
+                    'created_at': row[5],
+                    'metadata': row[6]
+                }
+        
+        return None
+    
+    def random_media_id(self, character_id: str, media_type: str = "image", limit: int = 20) -> Optional[str]:
+        """
+        Pick one of a character's most recent media ids at random
+        
+        The candidate list is cached for MEDIA_ID_CACHE_TTL seconds, so
+        frequent photo sends do not query the database each time.
+        """
+        key = (character_id, media_type, limit)
+        cached = self._media_ids.get(key)
+        if cached and cached[0] > time.monotonic():
+            ids = cached[1]
+        else:
+            ids = [m['id'] for m in self.get_character_media(character_id, media_type=media_type, limit=limit)]
+            self._media_ids[key] = (time.monotonic() + MEDIA_ID_CACHE_TTL, ids)
+        
+        return random.choice(ids) if ids else None
+    
+    def _invalidate_media_ids(self, character_id: str):
+        for key in [k for k in self._media_ids if k[0] == character_id]:
+            self._media_ids.pop(key, None)
+    
     def get_character_media(
         self,
         character_id: str,
@@ -153,14 +214,19 @@ class Gallery:
         if not media:
             return False
         
+        self._invalidate_media_ids(media['character_id'])
+        
         # Delete from database
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM media WHERE id = ?", (media_id,))
+            # Deduplicated uploads share one file between characters
+            cursor.execute("SELECT COUNT(*) FROM media WHERE filepath = ?", (media['filepath'],))
+            still_referenced = cursor.fetchone()[0] > 0
             conn.commit()
         
         # Delete files if requested
-        if delete_file:
+        if delete_file and not still_referenced:
             try:
                 filepath = Path(media['filepath'])
                 if filepath.exists():
@@ -2,18 +2,25 @@
 Phone Scene - Android Phone Simulation
 Main interface for phone-based interactions
 """
-from flask import Flask, render_template, jsonify, request, send_file
-from flask_socketio import SocketIO, emit
-from typing import Dict, List, Optional
+from flask import Flask, Response, render_template, jsonify, request, send_file
+from flask.json.provider import DefaultJSONProvider
+from flask_socketio import SocketIO, emit, join_room, leave_room, rooms
+from typing import Dict, List, Optional, Tuple
 import sys
 from pathlib import Path
 from datetime import datetime
 import uuid
+import json
 import os
+import time
 import random
+from bisect import bisect_right
 import threading
+from collections import OrderedDict
+from functools import wraps
 import requests as http_requests
 from werkzeug.utils import secure_filename
+from werkzeug.security import safe_join
 
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
@@ -23,6 +30,7 @@ from content.simulation.database.rag import RAGMemory
 from content.simulation.character_system.character import Character
 from content.simulation.services.media_generator import MediaGenerator
 from content.simulation.services.autonomous_messenger import AutonomousMessenger
+from content.simulation.services.realtime import character_room, run_blocking
 from content.simulation.services.voice_call import VoiceCallHandler
 from content.simulation.services.voice_message import VoiceMessageGenerator
 from content.simulation.services.video_call import VideoCallHandler
@@ -34,6 +42,118 @@ from content.simulation.services.llm_service import get_llm_service
 from content.simulation.services.anonymous_character import create_anonymous_character, AnonymousCharacter
 from content.simulation.services.cosylogger import install_logger, get_logs
 
+try:
+    from blake3 import blake3 as content_hasher
+except ImportError:
+    from hashlib import sha256 as content_hasher
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# MIME types accepted by /api/media/upload
+ALLOWED_MIME = frozenset({'image/jpeg', 'image/png', 'image/gif', 'image/webp'})
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Seconds a voice/video history body is served from memory
+HISTORY_CACHE_TTL = 30
+
+# Identical socket events from the same client within this many seconds are dropped
+DUPLICATE_EVENT_WINDOW = 10
+
+# One constant string so each pooled connection's statement cache reuses the prepared query
+MEDIA_HISTORY_SQL = (
+    "SELECT filepath, metadata, created_at FROM media "
+    "WHERE character_id = ? AND type = ? "
+    "ORDER BY created_at DESC LIMIT 20"
+)
+
+# Generated voice/video message folders, resolved once for the download routes
+_VOICE_DIR = str((Path(__file__).parent.parent / "media" / "voice").resolve())
+_VIDEO_DIR = str((Path(__file__).parent.parent / "media" / "video").resolve())
+
+# Loaded Character objects kept per scene, least recently used evicted first
+CHARACTER_CACHE_SIZE = 128
+
+# Seconds a cached Character is trusted before it is reloaded, so edits made
+# by other writers (autonomous messenger, other scenes) show up
+CHARACTER_CACHE_TTL = 60
+
+# Longest chat message accepted over the socket, in characters
+MAX_MESSAGE_LENGTH = 10000
+_MESSAGE_TOO_LONG = {'message': f'Message too long (max {MAX_MESSAGE_LENGTH} characters)'}
+
+# Generated voice/video files are never rewritten under the same name, so clients may keep them for a year
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+# Cumulative upper bounds of one random draw for spontaneous photo / voice / video
+# (5% / 3% / 2%); a draw past the last bound sends nothing
+SPONTANEOUS_MEDIA_THRESHOLDS = (0.05, 0.08, 0.10)
+
+# Pre-encoded bodies for the route guards below
+_NO_CHARACTER_BODY = b'{"error": "No active character"}'
+_NO_MESSENGER_BODY = b'{"error": "Autonomous messenger not initialized"}'
+
+
+def _json_bytes(obj) -> bytes:
+    """Encode obj as UTF-8 JSON, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj).encode('utf-8')
+
+
+# (whole second, formatted string) of the last now_iso() call
+_ts_cache = (0, "")
+
+
+def now_iso() -> str:
+    """
+    Local time as an ISO 8601 string at second resolution, formatted once per second.
+
+    For socket payloads only; stored messages keep microsecond timestamps
+    so they still sort in order within one second.
+    """
+    global _ts_cache
+    second = int(time.time())
+    cached_second, text = _ts_cache
+    if second != cached_second:
+        text = datetime.fromtimestamp(second).isoformat()
+        _ts_cache = (second, text)
+    return text
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider that encodes jsonify() bodies with orjson"""
+    
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+class OrjsonSocketIOCodec:
+    """
+    json-module stand-in for python-socketio packets.
+    
+    python-socketio passes stdlib keyword arguments (separators=...) and
+    expects str back, so those are ignored and the bytes decoded.
+    """
+    
+    @staticmethod
+    def dumps(obj, *args, **kwargs) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    
+    @staticmethod
+    def loads(s, *args, **kwargs):
+        return orjson.loads(s)
+
 
 class PhoneScene(BaseScene):
     """
@@ -74,6 +194,9 @@ class PhoneScene(BaseScene):
         self.media_dir = Path(__file__).parent.parent.parent / "media"
         self.media_dir.mkdir(exist_ok=True)
         
+        # Resolved root for the media download route (computed once, not per request)
+        self._media_root = str(self.media_dir.resolve())
+        
         # Initialize autonomous messenger (will be started later with socketio)
         self.autonomous_messenger = None
 
@@ -92,9 +215,16 @@ class PhoneScene(BaseScene):
         )
         self.app.config['SECRET_KEY'] = 'virtual_companion_secret'
         self.app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max upload
+        # Behind a front-end server that honours X-Sendfile, let it stream media files
+        self.app.config['USE_X_SENDFILE'] = os.getenv('COSYSIM_X_SENDFILE') == '1'
         
         # Socket.IO for real-time communication
-        self.socketio = SocketIO(self.app, cors_allowed_origins="*", manage_session=False)
+        if orjson is not None:
+            self.app.json = OrjsonProvider(self.app)
+            self.socketio = SocketIO(self.app, cors_allowed_origins="*", manage_session=False,
+                                     json=OrjsonSocketIOCodec)
+        else:
+            self.socketio = SocketIO(self.app, cors_allowed_origins="*", manage_session=False)
         
         # Connect voice and video services to socketio
         self.voice_call_handler.socketio = self.socketio
@@ -103,6 +233,17 @@ class PhoneScene(BaseScene):
         # Active character
         self.active_character: Optional[Character] = None
         
+        # (sid, event digest) -> expires_at, see _is_duplicate_event
+        self._recent_events: Dict[Tuple[str, str], float] = {}
+        self._recent_events_lock = threading.Lock()
+        
+        # (character_id, media type) -> (expires_at, json body, etag) for the history routes
+        self._history_cache: Dict[Tuple[str, str], Tuple[float, bytes, str]] = {}
+        
+        # character_id -> (loaded_at, Character), see _load_character
+        self._characters: "OrderedDict[str, Tuple[float, Character]]" = OrderedDict()
+        self._characters_lock = threading.Lock()
+        
         # Control-panel settings (configurable at runtime)
         self.settings: Dict = {
             "message_timeout": 180,   # seconds for LLM text response
@@ -127,9 +268,41 @@ class PhoneScene(BaseScene):
         self._setup_routes()
         self._setup_socketio()
     
+    def _conditional_json(self, payload, etag: Optional[str] = None):
+        """
+        JSON response that honours If-None-Match.
+        
+        Without an explicit etag the body is hashed, which saves the
+        transfer but not the work; callers with a cheap version counter
+        should check it first and pass it in.
+        """
+        resp = jsonify(payload)
+        if etag is None:
+            etag = content_hasher(resp.get_data()).hexdigest()[:16]
+        resp.set_etag(etag, weak=True)
+        return resp.make_conditional(request)
+    
     def _setup_routes(self):
         """Setup Flask routes"""
         
+        def requires_active_character(f):
+            """Answer 400 before running the route when no character is selected"""
+            @wraps(f)
+            def wrapper(*args, **kwargs):
+                if not self.active_character:
+                    return Response(_NO_CHARACTER_BODY, status=400, mimetype='application/json')
+                return f(*args, **kwargs)
+            return wrapper
+        
+        def requires_autonomous_messenger(f):
+            """Answer 500 before running the route when the messenger was never started"""
+            @wraps(f)
+            def wrapper(*args, **kwargs):
+                if not self.autonomous_messenger:
+                    return Response(_NO_MESSENGER_BODY, status=500, mimetype='application/json')
+                return f(*args, **kwargs)
+            return wrapper
+        
         @self.app.route('/')
         def index():
             """Phone home screen"""
@@ -150,7 +323,7 @@ class PhoneScene(BaseScene):
                 return jsonify({'error': 'No character_id provided'}), 400
             
             try:
-                self.active_character = Character.load(char_id, db=self.db)
+                self.active_character = self._load_character(char_id)
                 if not self.active_character:
                     return jsonify({'error': 'Character not found'}), 404
                 
@@ -174,18 +347,15 @@ class PhoneScene(BaseScene):
                 return jsonify({'error': str(e)}), 500
         
         @self.app.route('/api/character/info', methods=['GET'])
+        @requires_active_character
         def get_character_info():
             """Get active character info — full payload for the character editor"""
-            if not self.active_character:
-                return jsonify({'error': 'No active character'}), 400
-            return jsonify(self.active_character.to_dict())
+            return self._conditional_json(self.active_character.to_dict())
         
         @self.app.route('/api/messages/history', methods=['GET'])
+        @requires_active_character
         def get_message_history():
             """Get conversation history"""
-            if not self.active_character:
-                return jsonify({'error': 'No active character'}), 400
-            
             limit = request.args.get('limit', 50, type=int)
             chain_id = request.args.get('chain_id')
             
@@ -193,18 +363,10 @@ class PhoneScene(BaseScene):
                 # Get specific conversation chain
                 interactions = self.db.get_interaction_chain(chain_id)
             else:
-                # Get recent conversations
-                conversations = self.active_character.get_conversation_history(limit=10)
-                interactions = []
-                for conv in conversations:
-                    for msg in conv['messages']:
-                        interactions.append({
-                            'role': msg['role'],
-                            'content': msg['content'],
-                            'timestamp': msg['timestamp']
-                        })
-            
-            return jsonify({'messages': interactions})
+                # Get recent messages straight from the flat interactions log
+                interactions = self.db.get_recent_messages(self.active_character.id, limit)
+
+            return self._conditional_json({'messages': interactions})
         
         @self.app.route('/api/characters/list', methods=['GET'])
         def list_characters():
@@ -231,7 +393,7 @@ class PhoneScene(BaseScene):
             
             # Combine both
             all_characters = asset_characters + db_characters
-            return jsonify({'characters': all_characters})
+            return self._conditional_json({'characters': all_characters})
         
         @self.app.route('/api/character/load_asset', methods=['POST'])
         def load_character_asset():
@@ -313,11 +475,9 @@ class PhoneScene(BaseScene):
                 return jsonify({'error': str(e)}), 500
         
         @self.app.route('/api/autonomous/enable', methods=['POST'])
+        @requires_autonomous_messenger
         def enable_autonomous():
             """Enable autonomous messaging"""
-            if not self.autonomous_messenger:
-                return jsonify({'error': 'Autonomous messenger not initialized'}), 500
-            
             try:
                 self.autonomous_messenger.enable()
                 return jsonify({'success': True, 'enabled': True})
@@ -325,11 +485,9 @@ class PhoneScene(BaseScene):
                 return jsonify({'error': str(e)}), 500
         
         @self.app.route('/api/autonomous/disable', methods=['POST'])
+        @requires_autonomous_messenger
         def disable_autonomous():
             """Disable autonomous messaging"""
-            if not self.autonomous_messenger:
-                return jsonify({'error': 'Autonomous messenger not initialized'}), 500
-            
             try:
                 self.autonomous_messenger.disable()
                 return jsonify({'success': True, 'enabled': False})
@@ -337,11 +495,9 @@ class PhoneScene(BaseScene):
                 return jsonify({'error': str(e)}), 500
         
         @self.app.route('/api/autonomous/register', methods=['POST'])
+        @requires_autonomous_messenger
         def register_autonomous():
             """Register character for autonomous messaging"""
-            if not self.autonomous_messenger:
-                return jsonify({'error': 'Autonomous messenger not initialized'}), 500
-            
             data = request.json
             char_id = data.get('character_id')
             frequency = data.get('frequency', 'moderate')
@@ -363,11 +519,9 @@ class PhoneScene(BaseScene):
                 return jsonify({'error': str(e)}), 500
         
         @self.app.route('/api/autonomous/unregister', methods=['POST'])
+        @requires_autonomous_messenger
         def unregister_autonomous():
             """Unregister character from autonomous messaging"""
-            if not self.autonomous_messenger:
-                return jsonify({'error': 'Autonomous messenger not initialized'}), 500
-            
             data = request.json
             char_id = data.get('character_id')
             
@@ -381,33 +535,25 @@ class PhoneScene(BaseScene):
                 return jsonify({'error': str(e)}), 500
         
         @self.app.route('/api/autonomous/status', methods=['GET'])
+        @requires_autonomous_messenger
         def get_autonomous_status():
             """Get autonomous messenger status"""
-            if not self.autonomous_messenger:
-                return jsonify({'error': 'Autonomous messenger not initialized'}), 500
+            messenger = self.autonomous_messenger
+            etag = f"autonomous-{messenger.instance_id}-{messenger.version}"
+            if request.if_none_match.contains_weak(etag):
+                return Response(status=304, headers={'ETag': f'W/"{etag}"'})
             
             try:
-                return jsonify({
-                    'enabled': self.autonomous_messenger.enabled,
-                    'active_characters': list(self.autonomous_messenger.active_characters.keys()),
-                    'character_configs': {
-                        char_id: {
-                            'frequency': config['frequency'],
-                            'time_range': config['time_range'],
-                            'enable_photos': config['enable_photos']
-                        }
-                        for char_id, config in self.autonomous_messenger.active_characters.items()
-                    }
-                })
+                resp = Response(self.autonomous_messenger.status_snapshot(), mimetype='application/json')
+                resp.set_etag(etag, weak=True)
+                return resp
             except Exception as e:
                 return jsonify({'error': str(e)}), 500
         
         @self.app.route('/api/media/upload', methods=['POST'])
+        @requires_active_character
         def upload_media():
             """Upload photo from user"""
-            if not self.active_character:
-                return jsonify({'error': 'No active character'}), 400
-            
             if 'photo' not in request.files:
                 return jsonify({'error': 'No photo provided'}), 400
             
@@ -416,14 +562,16 @@ class PhoneScene(BaseScene):
                 return jsonify({'error': 'No file selected'}), 400
             
             # Validate MIME type
-            ALLOWED_TYPES = {'image/jpeg', 'image/png', 'image/gif', 'image/webp'}
-            
-            if file.content_type not in ALLOWED_TYPES:
+            if file.content_type not in ALLOWED_MIME:
                 return jsonify({'error': f'Invalid file type: {file.content_type}. Allowed: JPEG, PNG, GIF, WEBP'}), 400
             
-            # Save to temporary location first
+            # Stream to a temporary location, hashing as we go
             temp_path = self.media_dir / f"temp_{uuid.uuid4().hex[:8]}"
-            file.save(str(temp_path))
+            hasher = content_hasher()
+            with open(temp_path, 'wb') as out:
+                for chunk in iter(lambda: file.stream.read(UPLOAD_CHUNK_SIZE), b''):
+                    hasher.update(chunk)
+                    out.write(chunk)
             
             # Simple size check instead of imghdr (removed in Python 3.13)
             try:
@@ -435,13 +583,36 @@ class PhoneScene(BaseScene):
                     temp_path.unlink()
                 return jsonify({'error': f'File validation failed: {str(e)}'}), 400
             
-            # Move to final location with secure filename
-            filename = secure_filename(file.filename)
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            unique_filename = f"{timestamp}_{filename}"
-            filepath = self.media_dir / unique_filename
+            # Same bytes already uploaded for this character: reuse that entry
+            digest = hasher.hexdigest()
+            existing = self.gallery.get_by_hash(digest, self.active_character.id)
+            if existing:
+                temp_path.unlink()
+                return jsonify({
+                    'success': True,
+                    'media_id': existing['id'],
+                    'filepath': existing['filepath'],
+                    'duplicate': True
+                })
+            
+            # Move to content-addressed final location
+            extension = Path(secure_filename(file.filename)).suffix.lower()
+            timestamp = str(time.time_ns())
+            filepath = self.media_dir / f"{digest}{extension}"
             
-            temp_path.rename(filepath)
+            # Hard-link into place; an existing link means the bytes were
+            # stored earlier for another character, so share that file.
+            # Filesystems without hard links get the temp file moved instead
+            try:
+                os.link(temp_path, filepath)
+                created = True
+            except FileExistsError:
+                created = False
+            except OSError:
+                os.replace(temp_path, filepath)
+                created = True
+            finally:
+                temp_path.unlink(missing_ok=True)
             
             # Add to gallery
             try:
@@ -449,7 +620,8 @@ class PhoneScene(BaseScene):
                     character_id=self.active_character.id,
                     filepath=str(filepath),
                     media_type='image',
-                    metadata={'source': 'user_upload', 'timestamp': timestamp}
+                    metadata={'source': 'user_upload', 'timestamp': timestamp},
+                    content_hash=digest
                 )
                 
                 return jsonify({
@@ -459,7 +631,7 @@ class PhoneScene(BaseScene):
                 })
             except Exception as e:
                 # Clean up on error
-                if filepath.exists():
+                if created and filepath.exists():
                     filepath.unlink()
                 return jsonify({'error': str(e)}), 500
         
@@ -473,9 +645,8 @@ class PhoneScene(BaseScene):
                 
                 # Validate path is within media directory (prevent path traversal)
                 filepath = Path(media['filepath']).resolve()
-                media_dir = self.media_dir.resolve()
                 
-                if not str(filepath).startswith(str(media_dir)):
+                if not str(filepath).startswith(self._media_root):
                     return jsonify({'error': 'Invalid file path'}), 403
                 
                 if not filepath.exists():
@@ -486,11 +657,9 @@ class PhoneScene(BaseScene):
                 return jsonify({'error': str(e)}), 500
         
         @self.app.route('/api/media/gallery', methods=['GET'])
+        @requires_active_character
         def get_gallery():
             """Get all photos for active character"""
-            if not self.active_character:
-                return jsonify({'error': 'No active character'}), 400
-            
             try:
                 media_list = self.gallery.get_character_media(
                     character_id=self.active_character.id,
@@ -505,16 +674,14 @@ class PhoneScene(BaseScene):
                     'timestamp': m['created_at']
                 } for m in media_list]
                 
-                return jsonify({'photos': photos})
+                return self._conditional_json({'photos': photos})
             except Exception as e:
                 return jsonify({'error': str(e)}), 500
         
         @self.app.route('/api/media/generate', methods=['POST'])
+        @requires_active_character
         def generate_media():
             """Generate selfie for character"""
-            if not self.active_character:
-                return jsonify({'error': 'No active character'}), 400
-            
             data = request.json or {}
             mood = data.get('mood', self.active_character.mood)
             setting = data.get('setting', 'casual')
@@ -555,11 +722,9 @@ class PhoneScene(BaseScene):
         
         # Voice Call Routes
         @self.app.route('/api/call/start', methods=['POST'])
+        @requires_active_character
         def start_call():
             """Start a voice call"""
-            if not self.active_character:
-                return jsonify({'error': 'No active character'}), 400
-            
             data = request.json or {}
             call_type = data.get('type', 'outgoing')
             
@@ -627,11 +792,9 @@ class PhoneScene(BaseScene):
                 return jsonify({'error': str(e)}), 500
         
         @self.app.route('/api/call/history', methods=['GET'])
+        @requires_active_character
         def get_call_history():
             """Get call history"""
-            if not self.active_character:
-                return jsonify({'error': 'No active character'}), 400
-            
             try:
                 limit = request.args.get('limit', 10, type=int)
                 history = self.voice_call_handler.get_call_history(
@@ -639,17 +802,15 @@ class PhoneScene(BaseScene):
                     limit=limit
                 )
                 
-                return jsonify({'history': history})
+                return self._conditional_json({'history': history})
             except Exception as e:
                 return jsonify({'error': str(e)}), 500
         
         # Voice Message Routes
         @self.app.route('/api/voice/generate', methods=['POST'])
+        @requires_active_character
         def generate_voice_message():
             """Generate a voice message"""
-            if not self.active_character:
-                return jsonify({'error': 'No active character'}), 400
-            
             data = request.json or {}
             text = data.get('text')
             emotion = data.get('emotion', 'neutral')
@@ -666,6 +827,7 @@ class PhoneScene(BaseScene):
                 )
                 
                 if voice_msg:
+                    self._invalidate_history(self.active_character.id, 'voice')
                     return jsonify({
                         'success': True,
                         'filepath': voice_msg['filepath'],
@@ -680,11 +842,9 @@ class PhoneScene(BaseScene):
                 return jsonify({'error': str(e)}), 500
         
         @self.app.route('/api/voice/send', methods=['POST'])
+        @requires_active_character
         def send_voice_message():
             """Send a voice message in chat"""
-            if not self.active_character:
-                return jsonify({'error': 'No active character'}), 400
-            
             data = request.json or {}
             text = data.get('text')
             emotion = data.get('emotion', 'neutral')
@@ -692,87 +852,43 @@ class PhoneScene(BaseScene):
             if not text:
                 return jsonify({'error': 'No text provided'}), 400
             
-            try:
-                # Generate voice message
-                voice_msg = self.voice_message_generator.generate_voice_message(
-                    character_id=self.active_character.id,
-                    character_name=self.active_character.name,
-                    text=text,
-                    emotion=emotion
-                )
-                
-                if voice_msg:
-                    # Emit voice message via SocketIO
-                    self.socketio.emit('voice_message_received', {
-                        'role': 'assistant',
-                        'filename': voice_msg['filename'],
-                        'url': f"/api/voice/download/{voice_msg['filename']}",
-                        'duration': voice_msg['duration'],
-                        'text': voice_msg['text'],
-                        'timestamp': datetime.now().isoformat()
-                    })
-                    
-                    return jsonify({'success': True})
-                else:
-                    return jsonify({'error': 'Failed to generate voice message'}), 500
-            except Exception as e:
-                return jsonify({'error': str(e)}), 500
+            # Generated in the background; the message arrives over SocketIO
+            self._spawn_voice_message(
+                character_room(self.active_character.id), self.active_character, text, emotion
+            )
+            return jsonify({'success': True, 'pending': True}), 202
         
         @self.app.route('/api/voice/download/<filename>', methods=['GET'])
         def download_voice_message(filename):
             """Download/stream a voice message file"""
             try:
-                # Secure the filename
-                filename = secure_filename(filename)
-                voice_dir = Path(__file__).parent.parent / "media" / "voice"
-                filepath = voice_dir / filename
-                
-                if not filepath.exists():
+                # safe_join rejects traversal attempts and returns None; generated
+                # names embed the character name, so spaces etc. must stay allowed
+                filepath = safe_join(_VOICE_DIR, filename)
+                if not filepath or not os.path.isfile(filepath):
                     return jsonify({'error': 'File not found'}), 404
                 
-                return send_file(str(filepath), mimetype='audio/wav')
+                response = send_file(filepath, mimetype='audio/wav', conditional=True,
+                                     etag=True, max_age=IMMUTABLE_MAX_AGE)
+                response.cache_control.immutable = True
+                return response
             except Exception as e:
                 return jsonify({'error': str(e)}), 500
         
         @self.app.route('/api/voice/history', methods=['GET'])
+        @requires_active_character
         def get_voice_history():
             """Get voice message history"""
-            if not self.active_character:
-                return jsonify({'error': 'No active character'}), 400
-            
             try:
-                # Query voice messages from database
-                with self.db.get_connection() as conn:
-                    cursor = conn.cursor()
-                    cursor.execute("""
-                        SELECT filepath, metadata, timestamp
-                        FROM media
-                        WHERE character_id = ? AND type = 'voice'
-                        ORDER BY timestamp DESC
-                        LIMIT 20
-                    """, (self.active_character.id,))
-                    
-                    messages = []
-                    for row in cursor.fetchall():
-                        filepath = Path(row[0])
-                        messages.append({
-                            'filename': filepath.name,
-                            'url': f"/api/voice/download/{filepath.name}",
-                            'metadata': row[1],
-                            'timestamp': row[2]
-                        })
-                    
-                    return jsonify({'messages': messages})
+                return self._media_history_response('voice', '/api/voice/download/')
             except Exception as e:
                 return jsonify({'error': str(e)}), 500
         
         # Video Call Routes
         @self.app.route('/api/video-call/start', methods=['POST'])
+        @requires_active_character
         def start_video_call():
             """Start a video call"""
-            if not self.active_character:
-                return jsonify({'error': 'No active character'}), 400
-            
             data = request.json or {}
             call_type = data.get('type', 'outgoing')
             
@@ -853,11 +969,9 @@ class PhoneScene(BaseScene):
                 return jsonify({'error': str(e)}), 500
         
         @self.app.route('/api/video-call/history', methods=['GET'])
+        @requires_active_character
         def get_video_call_history():
             """Get video call history"""
-            if not self.active_character:
-                return jsonify({'error': 'No active character'}), 400
-            
             try:
                 limit = request.args.get('limit', 10, type=int)
                 history = self.video_call_handler.get_video_call_history(
@@ -865,17 +979,15 @@ class PhoneScene(BaseScene):
                     limit=limit
                 )
                 
-                return jsonify({'history': history})
+                return self._conditional_json({'history': history})
             except Exception as e:
                 return jsonify({'error': str(e)}), 500
         
         # Video Message Routes
         @self.app.route('/api/video-message/generate', methods=['POST'])
+        @requires_active_character
         def generate_video_message():
             """Generate a video message"""
-            if not self.active_character:
-                return jsonify({'error': 'No active character'}), 400
-            
             data = request.json or {}
             text = data.get('text')
             mood = data.get('mood', 'happy')
@@ -893,6 +1005,7 @@ class PhoneScene(BaseScene):
                 )
                 
                 if video_msg:
+                    self._invalidate_history(self.active_character.id, 'video_message')
                     return jsonify({
                         'success': True,
                         'filepath': video_msg['filepath'],
@@ -907,11 +1020,9 @@ class PhoneScene(BaseScene):
                 return jsonify({'error': str(e)}), 500
         
         @self.app.route('/api/video-message/send', methods=['POST'])
+        @requires_active_character
         def send_video_message():
             """Send a video message in chat"""
-            if not self.active_character:
-                return jsonify({'error': 'No active character'}), 400
-            
             data = request.json or {}
             text = data.get('text')
             mood = data.get('mood', 'happy')
@@ -919,78 +1030,38 @@ class PhoneScene(BaseScene):
             if not text:
                 return jsonify({'error': 'No text provided'}), 400
             
-            try:
-                # Generate video message
-                video_msg = self.video_message_generator.generate_video_message(
-                    character_id=self.active_character.id,
-                    character_name=self.active_character.name,
-                    character_description=self.active_character.appearance or "attractive person",
-                    text=text,
-                    mood=mood
-                )
-                
-                if video_msg:
-                    # Emit video message via SocketIO
-                    self.socketio.emit('video_message_received', {
-                        'role': 'assistant',
-                        'filename': video_msg['filename'],
-                        'url': f"/api/video-message/download/{video_msg['filename']}",
-                        'duration': video_msg['duration'],
-                        'text': video_msg['text'],
-                        'timestamp': datetime.now().isoformat()
-                    })
-                    
-                    return jsonify({'success': True})
-                else:
-                    return jsonify({'error': 'Failed to generate video message'}), 500
-            except Exception as e:
-                return jsonify({'error': str(e)}), 500
+            # Generated in the background; the message arrives over SocketIO
+            self._spawn_video_message(
+                character_room(self.active_character.id), self.active_character, text, mood
+            )
+            return jsonify({'success': True, 'pending': True}), 202
         
         @self.app.route('/api/video-message/download/<filename>', methods=['GET'])
         def download_video_message(filename):
             """Download/stream a video message file"""
             try:
-                # Secure the filename
-                filename = secure_filename(filename)
-                video_dir = Path(__file__).parent.parent / "media" / "video"
-                filepath = video_dir / filename
+                # safe_join rejects traversal attempts and returns None
+                filepath = safe_join(_VIDEO_DIR, filename)
                 
-                if not filepath.exists():
+                # isfile() also rejects directories in the same stat
+                if not filepath or not os.path.isfile(filepath):
                     return jsonify({'error': 'File not found'}), 404
                 
-                return send_file(str(filepath), mimetype='video/mp4')
+                # conditional=True answers Range requests so <video> can seek, and
+                # answers If-None-Match / If-Modified-Since with an empty 304
+                response = send_file(filepath, mimetype='video/mp4', conditional=True,
+                                     etag=True, max_age=IMMUTABLE_MAX_AGE)
+                response.cache_control.immutable = True
+                return response
             except Exception as e:
                 return jsonify({'error': str(e)}), 500
         
         @self.app.route('/api/video-message/history', methods=['GET'])
+        @requires_active_character
         def get_video_message_history():
             """Get video message history"""
-            if not self.active_character:
-                return jsonify({'error': 'No active character'}), 400
-            
             try:
-                # Query video messages from database
-                with self.db.get_connection() as conn:
-                    cursor = conn.cursor()
-                    cursor.execute("""
-                        SELECT filepath, metadata, timestamp
-                        FROM media
-                        WHERE character_id = ? AND type = 'video_message'
-                        ORDER BY timestamp DESC
-                        LIMIT 20
-                    """, (self.active_character.id,))
-                    
-                    messages = []
-                    for row in cursor.fetchall():
-                        filepath = Path(row[0])
-                        messages.append({
-                            'filename': filepath.name,
-                            'url': f"/api/video-message/download/{filepath.name}",
-                            'metadata': row[1],
-                            'timestamp': row[2]
-                        })
-                    
-                    return jsonify({'messages': messages})
+                return self._media_history_response('video_message', '/api/video-message/download/')
             except Exception as e:
                 return jsonify({'error': str(e)}), 500
 
@@ -1010,7 +1081,11 @@ class PhoneScene(BaseScene):
                 return jsonify({'error': 'Anonymous character not initialized'}), 503
             data = request.get_json() or {}
             user_msg = data.get('message', '')
-            reply = self.anon_char.receive_reply(user_msg) if user_msg else self.anon_char.send_message()
+            # The LLM call and the anon DB writes run off the hub so other sockets keep flowing
+            if user_msg:
+                reply = run_blocking(self.socketio, self.anon_char.receive_reply, user_msg)
+            else:
+                reply = run_blocking(self.socketio, self.anon_char.send_message)
             return jsonify({'reply': reply, 'info': self.anon_char.get_display_info()})
 
         @self.app.route('/api/anon/history', methods=['GET'])
@@ -1018,7 +1093,8 @@ class PhoneScene(BaseScene):
             """Get anonymous character conversation history."""
             if not self.anon_char:
                 return jsonify({'error': 'Anonymous character not initialized'}), 503
-            return jsonify({'history': self.anon_char.get_conversation_history()})
+            history = run_blocking(self.socketio, self.anon_char.get_conversation_history)
+            return jsonify({'history': history})
 
         # ── Control-Panel API ────────────────────────────────────────────────
 
@@ -1129,10 +1205,9 @@ class PhoneScene(BaseScene):
             return jsonify({'success': True, 'settings': self.settings})
 
         @self.app.route('/api/character/update', methods=['PATCH'])
+        @requires_active_character
         def update_character():
             """Update attributes of the active character and persist to DB."""
-            if not self.active_character:
-                return jsonify({'error': 'No active character'}), 400
             data = request.get_json() or {}
             # Whitelist accepted keys to prevent injection vectors
             ALLOWED = {
@@ -1149,6 +1224,8 @@ class PhoneScene(BaseScene):
                 self.active_character.save(**filtered)
             except Exception as e:
                 return jsonify({'error': f'Save failed: {e}'}), 500
+            if self.autonomous_messenger:
+                self.autonomous_messenger.invalidate_character(self.active_character.id)
             return jsonify({'success': True, 'character': self.active_character.to_dict()})
 
         @self.app.route('/api/logs', methods=['GET'])
@@ -1165,9 +1242,25 @@ class PhoneScene(BaseScene):
         @self.socketio.on('connect')
         def handle_connect():
             """Handle client connection"""
+            if self.active_character:
+                join_room(character_room(self.active_character.id))
             emit('connected', {'status': 'Connected to phone scene'})
             print("Client connected to phone scene")
         
+        @self.socketio.on('join_character')
+        def handle_join_character(data):
+            """Subscribe this client to pushes for the selected character"""
+            char_id = (data or {}).get('character_id')
+            if not char_id:
+                emit('error', {'message': 'No character_id provided'})
+                return
+            
+            # A client only follows one character at a time
+            for room in rooms():
+                if room.startswith('char:'):
+                    leave_room(room)
+            join_room(character_room(char_id))
+        
         @self.socketio.on('disconnect')
         def handle_disconnect():
             """Handle client disconnection"""
@@ -1180,69 +1273,50 @@ class PhoneScene(BaseScene):
                 emit('error', {'message': 'No active character'})
                 return
             
-            message = data.get('message', '')
-            
-            # Validate input
-            if not message:
+            # Validate before the dedup check so rejected payloads are never
+            # hashed; the length cap runs before strip() copies the string
+            raw = data.get('message') if isinstance(data, dict) else None
+            if not raw:
                 emit('error', {'message': 'Empty message'})
                 return
             
-            if not isinstance(message, str):
+            if not isinstance(raw, str):
                 emit('error', {'message': 'Invalid message type'})
                 return
             
-            # Enforce maximum length (10KB)
-            MAX_MESSAGE_LENGTH = 10000
-            if len(message) > MAX_MESSAGE_LENGTH:
-                emit('error', {'message': f'Message too long (max {MAX_MESSAGE_LENGTH} characters)'})
+            if len(raw) > MAX_MESSAGE_LENGTH:
+                emit('error', _MESSAGE_TOO_LONG)
                 return
             
-            # Strip leading/trailing whitespace
-            message = message.strip()
+            message = raw.strip()
             if not message:
                 emit('error', {'message': 'Empty message after trimming'})
                 return
             
+            if self._is_duplicate_event('send_message', data):
+                return
+            
             # Start conversation if needed
             if not self.current_chain_id:
                 self.current_chain_id = str(uuid.uuid4())
                 self.active_character.start_conversation(chain_id=self.current_chain_id)
             
-            # Add user message
-            self.active_character.add_message('user', message)
-            
-            # Emit user message
-            emit('message_received', {
+            # The user message is stored with the rest of the turn in _reply_job
+            user_entry = {
                 'role': 'user',
                 'content': message,
                 'timestamp': datetime.now().isoformat()
-            })
-            
-            # Show typing indicator
-            self.socketio.emit('typing', {'is_typing': True})
-            
-            # Signal active LLM request to the control panel
-            self._cancel_event.clear()
-            self._active_request_in_progress = True
-            self.socketio.emit('active_request_start', {'type': 'message'})
+            }
             
-            try:
-                # Generate response
-                response = self._generate_response(message)
-            finally:
-                self._active_request_in_progress = False
-                self.socketio.emit('active_request_end', {})
+            # Emit user message
+            emit('message_received', user_entry)
             
-            # Add assistant message
-            self.active_character.add_message('assistant', response)
+            # Show typing indicator
+            self.socketio.emit('typing', {'is_typing': True}, to=self._active_room())
             
-            # Hide typing indicator and emit response
-            self.socketio.emit('typing', {'is_typing': False})
-            emit('message_received', {
-                'role': 'assistant',
-                'content': response,
-                'timestamp': datetime.now().isoformat()
-            })
+            # The LLM call can take many seconds; reply from a background
+            # task so this handler returns and the worker serves other sockets
+            self.socketio.start_background_task(self._reply_job, request.sid, message, [user_entry])
         
         @self.socketio.on('start_call')
         def handle_start_call(data):
@@ -1285,7 +1359,7 @@ class PhoneScene(BaseScene):
                 success = self.voice_call_handler.answer_call(call_id)
                 
                 if success:
-                    self.socketio.emit('call_answered', {'call_id': call_id})
+                    self.socketio.emit('call_answered', {'call_id': call_id}, to=self._active_room())
                 else:
                     emit('error', {'message': 'Failed to answer call'})
             except Exception as e:
@@ -1323,33 +1397,17 @@ class PhoneScene(BaseScene):
                 emit('error', {'message': 'No active character'})
                 return
             
+            if self._is_duplicate_event('send_voice_message', data):
+                return
+            
             text = data.get('text')
             
             if not text:
                 emit('error', {'message': 'No text provided'})
                 return
             
-            try:
-                # Generate voice message
-                voice_msg = self.voice_message_generator.generate_voice_message(
-                    character_id=self.active_character.id,
-                    character_name=self.active_character.name,
-                    text=text
-                )
-                
-                if voice_msg:
-                    emit('voice_message_received', {
-                        'role': 'assistant',
-                        'filename': voice_msg['filename'],
-                        'url': f"/api/voice/download/{voice_msg['filename']}",
-                        'duration': voice_msg['duration'],
-                        'text': voice_msg['text'],
-                        'timestamp': datetime.now().isoformat()
-                    })
-                else:
-                    emit('error', {'message': 'Failed to generate voice message'})
-            except Exception as e:
-                emit('error', {'message': str(e)})
+            # Generate in the background and reply to this client only
+            self._spawn_voice_message(request.sid, self.active_character, text)
         
         @self.socketio.on('send_photo')
         def handle_send_photo(data):
@@ -1358,6 +1416,9 @@ class PhoneScene(BaseScene):
                 emit('error', {'message': 'No active character'})
                 return
             
+            if self._is_duplicate_event('send_photo', data):
+                return
+            
             media_id = data.get('media_id')
             if not media_id:
                 return
@@ -1373,7 +1434,7 @@ class PhoneScene(BaseScene):
                 'media_id': media_id,
                 'url': f"/api/media/download/{media_id}",
                 'role': 'user',
-                'timestamp': datetime.now().isoformat()
+                'timestamp': now_iso()
             })
             
             # Log to conversation
@@ -1381,37 +1442,36 @@ class PhoneScene(BaseScene):
                 self.active_character.add_message('user', f"[Photo sent: {media_id}]")
         
         @self.socketio.on('request_photo')
-        def handle_request_photo():
+        def handle_request_photo(data=None):
             """Handle photo request from user"""
             if not self.active_character:
                 emit('error', {'message': 'No active character'})
                 return
             
-            # Get character photos
-            media_list = self.gallery.get_character_media(
-                character_id=self.active_character.id,
-                media_type='image',
-                limit=10
-            )
+            # Only a resend of the same request_id is a duplicate; without one
+            # every request is genuine, since a user may ask again right away
+            if data and self._is_duplicate_event('request_photo', data):
+                return
             
-            if media_list:
-                # Send random photo
-                media = random.choice(media_list)
+            # Pick one of the character's recent photos
+            media_id = self.gallery.random_media_id(self.active_character.id, 'image', limit=10)
+            
+            if media_id:
                 emit('photo_received', {
-                    'media_id': media['id'],
-                    'url': f"/api/media/download/{media['id']}",
+                    'media_id': media_id,
+                    'url': f"/api/media/download/{media_id}",
                     'role': 'assistant',
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': now_iso()
                 })
                 
                 # Log to conversation
                 if self.current_chain_id:
-                    self.active_character.add_message('assistant', f"[Photo sent: {media['id']}]")
+                    self.active_character.add_message('assistant', f"[Photo sent: {media_id}]")
             else:
                 emit('message_received', {
                     'role': 'assistant',
                     'content': "I don't have any photos to send right now 😅",
-                    'timestamp': datetime.now().isoformat()
+                    'timestamp': now_iso()
                 })
         
         # Video Call SocketIO Events
@@ -1457,7 +1517,7 @@ class PhoneScene(BaseScene):
                 success = self.video_call_handler.answer_video_call(call_id)
                 
                 if success:
-                    self.socketio.emit('video_call_answered', {'call_id': call_id})
+                    self.socketio.emit('video_call_answered', {'call_id': call_id}, to=self._active_room())
                 else:
                     emit('error', {'message': 'Failed to answer video call'})
             except Exception as e:
@@ -1486,7 +1546,7 @@ class PhoneScene(BaseScene):
             
             try:
                 self.video_call_handler.toggle_video(enabled)
-                self.socketio.emit('video_toggled', {'enabled': enabled})
+                self.socketio.emit('video_toggled', {'enabled': enabled}, to=self._active_room())
             except Exception as e:
                 emit('error', {'message': str(e)})
         
@@ -1497,6 +1557,9 @@ class PhoneScene(BaseScene):
                 emit('error', {'message': 'No active character'})
                 return
             
+            if self._is_duplicate_event('send_video_message', data):
+                return
+            
             text = data.get('text')
             mood = data.get('mood', 'happy')
             
@@ -1504,31 +1567,218 @@ class PhoneScene(BaseScene):
                 emit('error', {'message': 'No text provided'})
                 return
             
-            try:
-                # Generate video message
-                video_msg = self.video_message_generator.generate_video_message(
-                    character_id=self.active_character.id,
-                    character_name=self.active_character.name,
-                    character_description=self.active_character.appearance or "attractive person",
-                    text=text,
-                    mood=mood
-                )
-                
-                if video_msg:
-                    emit('video_message_received', {
-                        'role': 'assistant',
-                        'filename': video_msg['filename'],
-                        'url': f"/api/video-message/download/{video_msg['filename']}",
-                        'duration': video_msg['duration'],
-                        'text': video_msg['text'],
-                        'timestamp': datetime.now().isoformat()
-                    })
-                else:
-                    emit('error', {'message': 'Failed to generate video message'})
-            except Exception as e:
-                emit('error', {'message': str(e)})
+            # Generate in the background and reply to this client only
+            self._spawn_video_message(request.sid, self.active_character, text, mood)
+    
+    def _active_room(self) -> Optional[str]:
+        """Room for the active character (None broadcasts, e.g. before one is chosen)"""
+        return character_room(self.active_character.id) if self.active_character else None
+    
+    # ============= EVENT DEDUP =============
+    
+    def _is_duplicate_event(self, event: str, data) -> bool:
+        """
+        True if this client sent the same event with the same payload within
+        DUPLICATE_EVENT_WINDOW seconds (e.g. a flaky mobile socket resending),
+        in which case the handler should do nothing.
+        """
+        payload = json.dumps(data, sort_keys=True, default=str).encode('utf-8')
+        key = (request.sid, content_hasher(event.encode('utf-8') + b'\0' + payload).hexdigest())
+        now = time.monotonic()
+        
+        with self._recent_events_lock:
+            expires_at = self._recent_events.get(key)
+            if expires_at and expires_at > now:
+                return True
+            if len(self._recent_events) > 1024:
+                self._recent_events = {k: v for k, v in self._recent_events.items() if v > now}
+            self._recent_events[key] = now + DUPLICATE_EVENT_WINDOW
+        return False
+    
+    # ============= MEDIA HISTORY =============
+    
+    def _media_history_response(self, media_type: str, download_prefix: str):
+        """
+        Last 20 media rows of one type for the active character, as JSON.
+        
+        The encoded body is kept for HISTORY_CACHE_TTL seconds (or until
+        _invalidate_history) since the phone UI polls these routes.
+        """
+        key = (self.active_character.id, media_type)
+        cached = self._history_cache.get(key)
+        if cached and cached[0] > time.monotonic():
+            _, body, etag = cached
+        else:
+            with self.db.get_connection() as conn:
+                rows = conn.execute(MEDIA_HISTORY_SQL, key).fetchall()
+            
+            # Only the file name is needed, so skip building a Path per row
+            messages = [{
+                'filename': name,
+                'url': f"{download_prefix}{name}",
+                'metadata': metadata,
+                'timestamp': created_at
+            } for name, metadata, created_at in (
+                (os.path.basename(filepath), metadata, created_at)
+                for filepath, metadata, created_at in rows
+            )]
+            
+            body = _json_bytes({'messages': messages})
+            etag = content_hasher(body).hexdigest()[:16]
+            self._history_cache[key] = (time.monotonic() + HISTORY_CACHE_TTL, body, etag)
+        
+        resp = Response(body, mimetype='application/json')
+        resp.set_etag(etag, weak=True)
+        return resp.make_conditional(request)
+    
+    def _invalidate_history(self, character_id: str, media_type: str):
+        """Drop a cached history body after a new media row was written"""
+        self._history_cache.pop((character_id, media_type), None)
+    
+    # ============= MEDIA JOBS =============
+    
+    def _spawn_voice_message(self, target: str, character: Character, text: str, emotion: str = 'neutral'):
+        """
+        Generate a voice message in a background task.
+        
+        Returns immediately; ``target`` (a socket sid or character room)
+        sees the typing indicator and then ``voice_message_received``.
+        """
+        self.socketio.emit('typing', {'is_typing': True}, to=target)
+        self.socketio.start_background_task(
+            self._voice_message_job, target, character.id, character.name, text, emotion
+        )
+    
+    def _voice_message_job(self, target: str, character_id: str, character_name: str, text: str, emotion: str):
+        try:
+            voice_msg = run_blocking(
+                self.socketio,
+                self.voice_message_generator.generate_voice_message,
+                character_id=character_id,
+                character_name=character_name,
+                text=text,
+                emotion=emotion
+            )
+            
+            if voice_msg:
+                self._invalidate_history(character_id, 'voice')
+                self.socketio.emit('voice_message_received', {
+                    'role': 'assistant',
+                    'filename': voice_msg['filename'],
+                    'url': f"/api/voice/download/{voice_msg['filename']}",
+                    'duration': voice_msg['duration'],
+                    'text': voice_msg['text'],
+                    'timestamp': now_iso()
+                }, to=target)
+            else:
+                self.socketio.emit('error', {'message': 'Failed to generate voice message'}, to=target)
+        except Exception as e:
+            self.socketio.emit('error', {'message': str(e)}, to=target)
+        finally:
+            self.socketio.emit('typing', {'is_typing': False}, to=target)
     
-    def _generate_response(self, user_message: str) -> str:
+    def _spawn_video_message(self, target: str, character: Character, text: str, mood: str = 'happy'):
+        """
+        Generate a video message in a background task.
+        
+        Returns immediately; ``target`` (a socket sid or character room)
+        sees the typing indicator and then ``video_message_received``.
+        """
+        self.socketio.emit('typing', {'is_typing': True}, to=target)
+        self.socketio.start_background_task(
+            self._video_message_job, target, character.id, character.name,
+            character.appearance or "attractive person", text, mood
+        )
+    
+    def _video_message_job(self, target: str, character_id: str, character_name: str,
+                           character_description: str, text: str, mood: str):
+        try:
+            video_msg = run_blocking(
+                self.socketio,
+                self.video_message_generator.generate_video_message,
+                character_id=character_id,
+                character_name=character_name,
+                character_description=character_description,
+                text=text,
+                mood=mood
+            )
+            
+            if video_msg:
+                self._invalidate_history(character_id, 'video_message')
+                self.socketio.emit('video_message_received', {
+                    'role': 'assistant',
+                    'filename': video_msg['filename'],
+                    'url': f"/api/video-message/download/{video_msg['filename']}",
+                    'duration': video_msg['duration'],
+                    'text': video_msg['text'],
+                    'timestamp': now_iso()
+                }, to=target)
+            else:
+                self.socketio.emit('error', {'message': 'Failed to generate video message'}, to=target)
+        except Exception as e:
+            self.socketio.emit('error', {'message': str(e)}, to=target)
+        finally:
+            self.socketio.emit('typing', {'is_typing': False}, to=target)
+    
+    def _reply_job(self, sid: str, message: str, turn: List[Dict]):
+        """
+        Generate the assistant reply to ``message`` and send it to ``sid``.
+        
+        ``turn`` starts with the user's message; media notes and the reply
+        are appended to it and the whole turn is stored in one transaction.
+        """
+        character = self.active_character
+        room = self._active_room()
+        response = None
+        
+        # Signal active LLM request to the control panel (not room-scoped:
+        # the control panel follows every request regardless of character)
+        self._cancel_event.clear()
+        self._active_request_in_progress = True
+        self.socketio.emit('active_request_start', {'type': 'message'})
+        
+        try:
+            # Generate response
+            response = self._generate_response(message, turn)
+        except Exception as e:
+            self.socketio.emit('typing', {'is_typing': False}, to=room)
+            self.socketio.emit('error', {'message': str(e)}, to=sid)
+        finally:
+            self._active_request_in_progress = False
+            self.socketio.emit('active_request_end', {})
+        
+        if response is not None:
+            reply = {
+                'role': 'assistant',
+                'content': response,
+                'timestamp': datetime.now().isoformat()
+            }
+            turn.append(reply)
+            
+            # Hide typing indicator and emit response
+            self.socketio.emit('typing', {'is_typing': False}, to=room)
+            self.socketio.emit('message_received', reply, to=sid)
+        
+        # One write for the whole turn (the user message is kept even if generation failed)
+        if character:
+            character.add_messages(turn)
+    
+    def _log_assistant_note(self, content: str, turn: Optional[List[Dict]] = None):
+        """Record a media note in the conversation, batched into ``turn`` when given"""
+        if not self.current_chain_id:
+            return
+        
+        entry = {
+            'role': 'assistant',
+            'content': content,
+            'timestamp': datetime.now().isoformat()
+        }
+        if turn is not None:
+            turn.append(entry)
+        else:
+            self.active_character.add_messages([entry])
+    
+    def _generate_response(self, user_message: str, turn: Optional[List[Dict]] = None) -> str:
         """
         Generate character response via LM Studio LLM.
         Parses intent and may trigger spontaneous media sends.
@@ -1544,10 +1794,10 @@ class PhoneScene(BaseScene):
             conv_history = self.active_character.get_conversation_history(limit=10)
             for conv in conv_history:
                 if isinstance(conv, dict):
-                    for turn in conv.get("messages", []):
-                        if isinstance(turn, dict):
-                            role = turn.get("role", "user")
-                            content = turn.get("content", "")
+                    for msg in conv.get("messages", []):
+                        if isinstance(msg, dict):
+                            role = msg.get("role", "user")
+                            content = msg.get("content", "")
                             if role and content:
                                 history.append({"role": role, "content": content})
         except Exception:
@@ -1601,81 +1851,82 @@ class PhoneScene(BaseScene):
 
         # User explicitly asked for a selfie
         if intent.get("wants_selfie") and rel > 0.2:
-            self._maybe_send_photo()
+            self._maybe_send_photo(turn)
+
+        # Voice and video take seconds to generate, so they run as background
+        # tasks and arrive after the text reply rather than delaying it
 
         # User asked for a voice message
         if intent.get("wants_voice") and rel > 0.3:
-            self._maybe_send_voice_message(response)
+            self.socketio.start_background_task(self._maybe_send_voice_message, response)
 
         # User asked for a video message
         if intent.get("wants_video") and rel > 0.4:
-            self._maybe_send_video_message(response)
+            self.socketio.start_background_task(self._maybe_send_video_message, response)
 
         # Spontaneous media (low probability unless intent triggered)
         if rel >= 0.5 and not any(intent.values()):
-            r = random.random()
-            if r < 0.05:
-                self._maybe_send_photo()
-            elif r < 0.08:
-                self._maybe_send_voice_message(response)
-            elif r < 0.10:
-                self._maybe_send_video_message(response)
+            pick = bisect_right(SPONTANEOUS_MEDIA_THRESHOLDS, random.random())
+            if pick == 0:
+                self._maybe_send_photo(turn)
+            elif pick == 1:
+                self.socketio.start_background_task(self._maybe_send_voice_message, response)
+            elif pick == 2:
+                self.socketio.start_background_task(self._maybe_send_video_message, response)
 
         return response
     
     def _maybe_send_voice_message(self, text: str):
-        """Character may spontaneously send a voice message"""
+        """Character may spontaneously send a voice message (run as a background task)"""
         try:
-            voice_msg = self.voice_message_generator.generate_voice_message(
+            voice_msg = run_blocking(
+                self.socketio,
+                self.voice_message_generator.generate_voice_message,
                 character_id=self.active_character.id,
                 character_name=self.active_character.name,
                 text=text
             )
             
             if voice_msg:
+                self._invalidate_history(self.active_character.id, 'voice')
                 self.socketio.emit('voice_message_received', {
                     'role': 'assistant',
                     'filename': voice_msg['filename'],
                     'url': f"/api/voice/download/{voice_msg['filename']}",
                     'duration': voice_msg['duration'],
                     'text': voice_msg['text'],
-                    'timestamp': datetime.now().isoformat()
-                })
+                    'timestamp': now_iso()
+                }, to=self._active_room())
                 
                 # Log to conversation
-                if self.current_chain_id:
-                    self.active_character.add_message('assistant', f"[Voice message: {text}]")
+                self._log_assistant_note(f"[Voice message: {text}]")
         except Exception as e:
             print(f"Error sending voice message: {e}")
     
-    def _maybe_send_photo(self):
+    def _maybe_send_photo(self, turn: Optional[List[Dict]] = None):
         """Character may spontaneously send a photo"""
         try:
-            media_list = self.gallery.get_character_media(
-                character_id=self.active_character.id,
-                media_type='image',
-                limit=20
-            )
+            media_id = self.gallery.random_media_id(self.active_character.id, 'image', limit=20)
             
-            if media_list:
-                media = random.choice(media_list)
+            if media_id:
                 self.socketio.emit('photo_received', {
-                    'media_id': media['id'],
-                    'url': f"/api/media/download/{media['id']}",
+                    'media_id': media_id,
+                    'url': f"/api/media/download/{media_id}",
                     'role': 'assistant',
-                    'timestamp': datetime.now().isoformat()
-                })
+                    'timestamp': now_iso()
+                }, to=self._active_room())
                 
                 # Log to conversation
-                if self.current_chain_id:
-                    self.active_character.add_message('assistant', f"[Photo sent: {media['id']}]")
+                self._log_assistant_note(f"[Photo sent: {media_id}]", turn)
         except Exception as e:
             print(f"Error sending photo: {e}")
     
     def _maybe_send_video_message(self, text: str):
-        """Character may spontaneously send a video message"""
+        """Character may spontaneously send a video message (run as a background task)"""
         try:
-            video_msg = self.video_message_generator.generate_video_message(
+            video_msg = run_blocking(
+                self.socketio,
+                self.video_message_generator.generate_video_message,
                 character_id=self.active_character.id,
                 character_name=self.active_character.name,
                 character_description=self.active_character.appearance or "attractive person",
@@ -1684,24 +1935,47 @@ class PhoneScene(BaseScene):
             )
             
             if video_msg:
+                self._invalidate_history(self.active_character.id, 'video_message')
                 self.socketio.emit('video_message_received', {
                     'role': 'assistant',
                     'filename': video_msg['filename'],
                     'url': f"/api/video-message/download/{video_msg['filename']}",
                     'duration': video_msg['duration'],
                     'text': video_msg['text'],
-                    'timestamp': datetime.now().isoformat()
-                })
+                    'timestamp': now_iso()
+                }, to=self._active_room())
                 
                 # Log to conversation
-                if self.current_chain_id:
-                    self.active_character.add_message('assistant', f"[Video message: {text}]")
+                self._log_assistant_note(f"[Video message: {text}]")
         except Exception as e:
             print(f"Error sending video message: {e}")
     
     def set_character(self, character_id: str):
         """Set active character (legacy database method)"""
-        self.active_character = Character.load(character_id, db=self.db)
+        self.active_character = self._load_character(character_id)
+    
+    # ============= CHARACTER CACHE =============
+    
+    def _load_character(self, character_id: str) -> Optional[Character]:
+        """Character.load through a small LRU, so switching back to a character skips the DB"""
+        with self._characters_lock:
+            entry = self._characters.get(character_id)
+            if entry is not None and time.monotonic() - entry[0] < CHARACTER_CACHE_TTL:
+                self._characters.move_to_end(character_id)
+                return entry[1]
+        
+        char = Character.load(character_id, db=self.db)
+        if char is not None:
+            with self._characters_lock:
+                self._characters[character_id] = (time.monotonic(), char)
+                self._characters.move_to_end(character_id)
+                while len(self._characters) > CHARACTER_CACHE_SIZE:
+                    self._characters.popitem(last=False)
+        return char
+    
+    def _invalidate_character(self, character_id: str):
+        with self._characters_lock:
+            self._characters.pop(character_id, None)
     
     def _asset_to_character(self, char_asset: CharacterAsset) -> Character:
         """
@@ -1710,7 +1984,7 @@ class PhoneScene(BaseScene):
         """
         # Try to load existing character from database
         try:
-            char = Character.load(char_asset.id, db=self.db)
+            char = self._load_character(char_asset.id)
             if char:
                 return char
         except:
@@ -1746,8 +2020,9 @@ class PhoneScene(BaseScene):
                 cursor.execute("UPDATE character_states SET character_id = ? WHERE character_id = ?", (char_asset.id, char_id_new))
                 conn.commit()
         
-        # Load and return
-        return Character.load(char_asset.id, db=self.db)
+        # Load and return (drop anything cached under the asset id first)
+        self._invalidate_character(char_asset.id)
+        return self._load_character(char_asset.id)
     
     def start(self) -> None:
         """Start the phone scene (Flask + SocketIO server)"""
@@ -1757,6 +2032,8 @@ class PhoneScene(BaseScene):
         """Stop the phone scene and cleanup"""
         if self.autonomous_messenger:
             self.autonomous_messenger.disable()
+        if self.anon_char:
+            self.anon_char.flush()
         print("🛑 Phone Scene stopped")
     
     def run(self, debug: bool = False):
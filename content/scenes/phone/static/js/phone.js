@@ -133,6 +133,7 @@ async function selectCharacter() {
         
         if (data.success) {
             currentCharacter = data.character;
+            socket.emit('join_character', { character_id: currentCharacter.id });
             updateCharacterUI();
             console.log('Character set:', data.character.name);
         } else if (data.error) {
@@ -147,6 +148,7 @@ async function selectCharacter() {
                 const fallbackData = await fallbackResponse.json();
                 if (fallbackData.success) {
                     currentCharacter = fallbackData.character;
+                    socket.emit('join_character', { character_id: currentCharacter.id });
                     updateCharacterUI();
                     console.log('Character set (fallback):', fallbackData.character.name);
                 }
@@ -686,7 +688,8 @@ function requestPhoto() {
         return;
     }
     
-    socket.emit('request_photo');
+    // Unique per tap, so the server only drops resends of this same request
+    socket.emit('request_photo', { request_id: `${Date.now()}-${Math.random().toString(36).slice(2)}` });
 }
 
 // Gallery functions
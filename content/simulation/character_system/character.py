@@ -2,8 +2,10 @@
 Character Class for Virtual Companion System
 Manages character attributes, state, memory, and behavior
 """
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
+import hashlib
+import time
 import uuid
 import sys
 from pathlib import Path
@@ -15,6 +17,10 @@ sys.path.insert(0, str(project_root))
 from content.simulation.database.db import Database
 from content.simulation.database.rag import RAGMemory
 
+# build_context() results are reused for the same input within this window
+CONTEXT_CACHE_TTL = 600
+CONTEXT_CACHE_SIZE = 64
+
 
 class Character:
     """
@@ -51,6 +57,10 @@ class Character:
         # Cache for current conversation
         self._current_chain_id = None
         self._current_conversation_id = None
+        
+        # Derived-text caches (see get_system_prompt / build_context)
+        self._system_prompt: Optional[str] = None
+        self._context_cache: Dict[bytes, Tuple[float, str]] = {}
     
     # ============= PROPERTIES =============
     
@@ -174,6 +184,7 @@ class Character:
         if success:
             # Reload data
             self._data = self.db.get_character(self.id)
+            self._system_prompt = None
         return success
 
     def save(self, **kwargs) -> bool:
@@ -222,6 +233,7 @@ class Character:
                 if pers:
                     char_kwargs['personality_id'] = pers['id']
                     self._personality = pers
+                    self._system_prompt = None
                 else:
                     meta_updates['personality_name'] = v
             else:
@@ -284,6 +296,7 @@ class Character:
         if success:
             # Reload state
             self._state = self.db.get_character_state(self.id)
+            self._system_prompt = None
         return success
     
     def set_mood(self, mood: str) -> bool:
@@ -331,6 +344,28 @@ class Character:
             print(f"Error adding interaction: {e}")
             return False
     
+    @staticmethod
+    def add_interactions_bulk(db: Database, entries: List[Tuple[str, str, Dict]]) -> int:
+        """
+        Store many interactions in one transaction
+        
+        Args:
+            db: Database to write to
+            entries: (character_id, interaction_type, details) tuples; details
+                may carry 'content' and 'timestamp', the rest becomes metadata
+        
+        Returns:
+            Number of interactions stored
+        """
+        now = datetime.now().isoformat()
+        rows = []
+        for character_id, interaction_type, details in entries:
+            metadata = dict(details)
+            content = metadata.pop('content', '')
+            timestamp = metadata.pop('timestamp', None) or now
+            rows.append((interaction_type, character_id, content, metadata, None, timestamp))
+        return db.log_interactions(rows)
+    
     # ============= MEMORY OPERATIONS =============
     
     def add_memory(self, content: str, memory_type: str = "conversation", importance: float = 0.5, **kwargs) -> str:
@@ -376,14 +411,33 @@ class Character:
         return self.rag.get_important_memories(self.id, n_results=n_results, min_importance=min_importance)
     
     def build_context(self, current_input: str) -> str:
-        """Build context from memories for current interaction"""
-        return self.rag.build_context(
+        """
+        Build context from memories for current interaction
+        
+        Repeats of the same input (client retries, resends) within
+        CONTEXT_CACHE_TTL reuse the previous result instead of querying
+        the vector store again.
+        """
+        key = hashlib.sha256(current_input.encode('utf-8')).digest()
+        now = time.monotonic()
+        cached = self._context_cache.get(key)
+        if cached and cached[0] > now:
+            return cached[1]
+        
+        context = self.rag.build_context(
             self.id, 
             current_input,
             n_recent=5,
             n_semantic=5,
             n_important=3
         )
+        
+        if len(self._context_cache) >= CONTEXT_CACHE_SIZE:
+            self._context_cache = {k: v for k, v in self._context_cache.items() if v[0] > now}
+            if len(self._context_cache) >= CONTEXT_CACHE_SIZE:
+                self._context_cache.pop(next(iter(self._context_cache)))
+        self._context_cache[key] = (now + CONTEXT_CACHE_TTL, context)
+        return context
     
     # ============= CONVERSATION MANAGEMENT =============
     
@@ -421,15 +475,6 @@ class Character:
         Returns:
             Success status
         """
-        if not self._current_conversation_id:
-            self.start_conversation()
-        
-        # Get current conversation
-        conv = self.db.get_conversation(self._current_conversation_id)
-        if not conv:
-            return False
-        
-        # Add message
         message = {
             "role": role,
             "content": content,
@@ -438,29 +483,44 @@ class Character:
         if metadata:
             message["metadata"] = metadata
         
-        messages = conv['messages']
-        messages.append(message)
+        return self.add_messages([message])
+    
+    def add_messages(self, messages: List[Dict]) -> bool:
+        """
+        Add several messages to current conversation in one transaction
+        
+        Args:
+            messages: Dicts with 'role', 'content', 'timestamp' and optional
+                'metadata', in conversation order
         
-        # Update conversation
-        success = self.db.update_conversation(self._current_conversation_id, messages)
+        Returns:
+            Success status
+        """
+        if not messages:
+            return True
+        
+        if not self._current_conversation_id:
+            self.start_conversation()
+        
+        # Update conversation and log interactions
+        success = self.db.append_conversation_messages(
+            self._current_conversation_id,
+            self.id,
+            messages,
+            chain_id=self._current_chain_id
+        )
         
-        # Log interaction
         if success:
-            self.db.log_interaction(
-                "message",
-                self.id,
-                content,
-                chain_id=self._current_chain_id,
-                metadata={"role": role, **(metadata or {})}
-            )
-            
             # Add to memory if it's an important message
-            if role == "user" or (metadata and metadata.get('important')):
-                self.add_memory(
-                    f"{role}: {content}",
-                    memory_type="conversation",
-                    importance=metadata.get('importance', 0.5) if metadata else 0.5
-                )
+            for message in messages:
+                role = message['role']
+                metadata = message.get('metadata')
+                if role == "user" or (metadata and metadata.get('important')):
+                    self.add_memory(
+                        f"{role}: {message['content']}",
+                        memory_type="conversation",
+                        importance=metadata.get('importance', 0.5) if metadata else 0.5
+                    )
         
         return success
     
@@ -502,7 +562,10 @@ class Character:
     # ============= BEHAVIOR & AI =============
     
     def get_system_prompt(self) -> str:
-        """Build system prompt from character data"""
+        """Build system prompt from character data (cached until data or state changes)"""
+        if self._system_prompt is not None:
+            return self._system_prompt
+        
         parts = []
         
         # Base personality
@@ -525,7 +588,8 @@ class Character:
             style = self._personality['communication_style']
             parts.append(f"\n## Communication Style\n{style}")
         
-        return "\n".join(parts)
+        self._system_prompt = "\n".join(parts)
+        return self._system_prompt
     
     def should_initiate_interaction(self) -> bool:
         """
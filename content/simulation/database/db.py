@@ -8,8 +8,37 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
 import uuid
+import queue
+import threading
 from contextlib import contextmanager
 
+# Idle connections kept open per Database; extra ones are closed on release
+CONNECTION_POOL_SIZE = 8
+
+# Prepared statements kept per connection (sqlite3 defaults to 128)
+STATEMENT_CACHE_SIZE = 256
+
+# Applied to every new connection. WAL itself is persistent and is set once in init_database.
+# 64 MB page cache and 256 MB mmap keep the hot history/media index pages resident.
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA busy_timeout=5000",
+)
+
+# One write lock per database file, shared by every Database instance in the process
+_WRITE_LOCKS: Dict[str, threading.Lock] = {}
+_WRITE_LOCKS_GUARD = threading.Lock()
+
+
+def _write_lock_for(db_path: Path) -> threading.Lock:
+    """Return the process-wide write lock for db_path"""
+    key = str(db_path.resolve())
+    with _WRITE_LOCKS_GUARD:
+        return _WRITE_LOCKS.setdefault(key, threading.Lock())
+
 
 class Database:
     """Central SQLite database for the simulation system"""
@@ -17,13 +46,30 @@ class Database:
     def __init__(self, db_path: str = "simulation/simulation.db"):
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(maxsize=CONNECTION_POOL_SIZE)
+        # SQLite allows one writer at a time; hot write paths share one connection behind a
+        # lock, and the lock is shared with other Database objects on the same file
+        self._writer: Optional[sqlite3.Connection] = None
+        self._write_lock = _write_lock_for(self.db_path)
         self.init_database()
     
+    def _connect(self) -> sqlite3.Connection:
+        # Pooled connections move between request threads, never shared concurrently
+        conn = sqlite3.connect(
+            str(self.db_path), check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE
+        )
+        conn.row_factory = sqlite3.Row
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+    
     @contextmanager
     def get_connection(self):
-        """Context manager for database connections"""
-        conn = sqlite3.connect(str(self.db_path))
-        conn.row_factory = sqlite3.Row
+        """Context manager for database connections (borrowed from a small pool)"""
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
         try:
             yield conn
             conn.commit()
@@ -31,13 +77,49 @@ class Database:
             conn.rollback()
             raise e
         finally:
-            conn.close()
+            try:
+                self._pool.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+    
+    @contextmanager
+    def get_write_connection(self):
+        """
+        Context manager for the single writer connection. The transaction starts
+        with BEGIN IMMEDIATE so a read-then-write never has to upgrade its lock.
+        """
+        with self._write_lock:
+            if self._writer is None:
+                self._writer = self._connect()
+            conn = self._writer
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                raise e
+    
+    def close(self):
+        """Close the writer and all idle pooled connections"""
+        with self._write_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
     
     def init_database(self):
         """Initialize all database tables"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
             
+            # Readers (history queries) no longer block on media/message writers
+            cursor.execute("PRAGMA journal_mode=WAL")
+            
             # Characters table
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS characters (
@@ -159,12 +241,21 @@ class Database:
                 )
             """)
             
+            # Migrations for databases created before a column existed
+            cursor.execute("PRAGMA table_info(media)")
+            if 'hash' not in {row[1] for row in cursor.fetchall()}:
+                cursor.execute("ALTER TABLE media ADD COLUMN hash TEXT")
+            
             # Create indexes for performance
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_memories_character ON memories(character_id)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_conversations_character ON conversations(character_id)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_interactions_character ON interactions(character_id)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_interactions_chain ON interactions(chain_id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_interactions_character_type_time ON interactions(character_id, type, timestamp)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_interactions_char_chain_ts ON interactions(character_id, chain_id, timestamp DESC)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_media_character ON media(character_id)")
+            cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_media_character_hash ON media(character_id, hash)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_media_char_type_created ON media(character_id, type, created_at DESC)")
     
     # ============= CHARACTER OPERATIONS =============
     
@@ -510,7 +601,7 @@ class Database:
         """Update conversation messages"""
         messages_json = json.dumps(messages)
         
-        with self.get_connection() as conn:
+        with self.get_write_connection() as conn:
             cursor = conn.cursor()
             
             if ended:
@@ -529,6 +620,43 @@ class Database:
             
             return cursor.rowcount > 0
     
+    def append_conversation_messages(
+        self,
+        conv_id: str,
+        character_id: str,
+        messages: List[Dict],
+        chain_id: Optional[str] = None
+    ) -> bool:
+        """
+        Append messages to a conversation and log each one as a 'message'
+        interaction, all in a single transaction
+        """
+        with self.get_write_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT messages FROM conversations WHERE id = ?", (conv_id,))
+            row = cursor.fetchone()
+            if not row:
+                return False
+            
+            stored = json.loads(row[0])
+            stored.extend(messages)
+            cursor.execute("UPDATE conversations SET messages = ? WHERE id = ?", (json.dumps(stored), conv_id))
+            
+            cursor.executemany("""
+                INSERT INTO interactions 
+                (id, type, character_id, content, metadata, timestamp, chain_id)
+                VALUES (?, 'message', ?, ?, ?, ?, ?)
+            """, [
+                (
+                    str(uuid.uuid4()), character_id, message['content'],
+                    json.dumps({"role": message['role'], **message.get('metadata', {})}),
+                    message['timestamp'], chain_id
+                )
+                for message in messages
+            ])
+        
+        return True
+    
     def get_conversation(self, conv_id: str) -> Optional[Dict]:
         """Get conversation by ID"""
         with self.get_connection() as conn:
@@ -573,7 +701,7 @@ class Database:
         
         metadata = json.dumps(kwargs.get('metadata', {}))
         
-        with self.get_connection() as conn:
+        with self.get_write_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 INSERT INTO interactions 
@@ -586,6 +714,26 @@ class Database:
         
         return inter_id
     
+    def log_interactions(self, rows: List[Tuple[str, str, str, Dict, Optional[str], str]]) -> int:
+        """
+        Log many interactions in one transaction.
+        Each row is (type, character_id, content, metadata, chain_id, timestamp).
+        """
+        if not rows:
+            return 0
+        
+        with self.get_write_connection() as conn:
+            conn.executemany("""
+                INSERT INTO interactions 
+                (id, type, character_id, content, metadata, timestamp, chain_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, [
+                (str(uuid.uuid4()), itype, character_id, content, json.dumps(metadata), timestamp, chain_id)
+                for itype, character_id, content, metadata, chain_id, timestamp in rows
+            ])
+        
+        return len(rows)
+    
     def get_interaction_chain(self, chain_id: str) -> List[Dict]:
         """Get all interactions in a chain"""
         with self.get_connection() as conn:
@@ -593,7 +741,7 @@ class Database:
             cursor.execute("""
                 SELECT * FROM interactions 
                 WHERE chain_id = ?
-                ORDER BY timestamp ASC
+                ORDER BY timestamp ASC, rowid ASC
             """, (chain_id,))
             rows = cursor.fetchall()
             
@@ -604,7 +752,22 @@ class Database:
                 interactions.append(inter)
             
             return interactions
-    
+
+    def get_recent_messages(self, character_id: str, limit: int = 50) -> List[Dict]:
+        """Get the most recent chat messages for a character, oldest first"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT json_extract(metadata, '$.role') AS role, content, timestamp
+                FROM interactions
+                WHERE character_id = ? AND type = 'message'
+                ORDER BY timestamp DESC, rowid DESC
+                LIMIT ?
+            """, (character_id, limit))
+            rows = cursor.fetchall()
+
+            return [dict(row) for row in reversed(rows)]
+
     # ============= CHARACTER STATE OPERATIONS =============
     
     def get_character_state(self, character_id: str) -> Optional[Dict]:
@@ -650,7 +813,7 @@ class Database:
         values.append(timestamp)
         values.append(character_id)
         
-        with self.get_connection() as conn:
+        with self.get_write_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(f"""
                 UPDATE character_states 
@@ -669,7 +832,7 @@ class Database:
         
         metadata = json.dumps(kwargs.get('metadata', {}))
         
-        with self.get_connection() as conn:
+        with self.get_write_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 INSERT INTO media 
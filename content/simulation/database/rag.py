@@ -6,10 +6,17 @@ import chromadb
 from chromadb.config import Settings
 from chromadb.utils import embedding_functions
 from typing import List, Dict, Optional, Any
+from collections import OrderedDict
+import threading
 import uuid
 from datetime import datetime
 from pathlib import Path
 
+import numpy as np
+
+# Number of distinct query strings whose embeddings are kept in memory
+QUERY_EMBEDDING_CACHE_SIZE = 1024
+
 
 class RAGMemory:
     """RAG-based memory system using ChromaDB"""
@@ -38,6 +45,12 @@ class RAGMemory:
         # Use default embedding function (all-MiniLM-L6-v2)
         self.embedding_function = embedding_functions.DefaultEmbeddingFunction()
         
+        # Query text -> float32 embedding bytes (LRU). Stored documents are
+        # embedded once by ChromaDB on add; this saves re-embedding the same
+        # query on every context build.
+        self._query_embeddings: "OrderedDict[str, bytes]" = OrderedDict()
+        self._query_embeddings_lock = threading.Lock()
+        
         # Get or create collection
         try:
             self.collection = self.client.get_collection(
@@ -154,6 +167,23 @@ class RAGMemory:
         
         return memory_ids
     
+    def _embed_query(self, text: str) -> List[float]:
+        """Embedding for a query string, served from the LRU cache when possible"""
+        with self._query_embeddings_lock:
+            cached = self._query_embeddings.get(text)
+            if cached is not None:
+                self._query_embeddings.move_to_end(text)
+        
+        if cached is None:
+            vector = self.embedding_function([text])[0]
+            cached = np.asarray(vector, dtype=np.float32).tobytes()
+            with self._query_embeddings_lock:
+                self._query_embeddings[text] = cached
+                if len(self._query_embeddings) > QUERY_EMBEDDING_CACHE_SIZE:
+                    self._query_embeddings.popitem(last=False)
+        
+        return np.frombuffer(cached, dtype=np.float32).tolist()
+    
     def query_memories(
         self,
         character_id: str,
@@ -192,7 +222,7 @@ class RAGMemory:
         
         # Query ChromaDB
         results = self.collection.query(
-            query_texts=[query],
+            query_embeddings=[self._embed_query(query)],
             n_results=n_results,
             where=where
         )
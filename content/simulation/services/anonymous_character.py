@@ -4,23 +4,61 @@ A mysterious, context-aware anonymous contact that appears in the phone scene.
 Includes hacker, secret admirer, mystery persona types with triggered events.
 """
 
+import atexit
 import random
 import json
 import uuid
 import logging
-from datetime import datetime, timedelta
+import queue
+from collections import deque
+import threading
+import time
+from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict, List, Any
+from typing import Optional, Deque, Dict, List, Any, Tuple
 import sys
 
 project_root = Path(__file__).parent.parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from content.simulation.database.db import Database
-from content.simulation.services.llm_service import get_llm_service
+
+try:
+    import orjson
+
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+except ImportError:
+    def _dumps(obj) -> str:
+        return json.dumps(obj, separators=(",", ":"))
 
 logger = logging.getLogger(__name__)
 
+# Private generator for event/fallback text, so these picks don't share the global
+# random module's state with the rest of the app
+_rng = random.Random()
+
+# Most recent messages sent to the LLM as context; older ones are dropped from memory
+LLM_CONTEXT_MESSAGES = 15
+
+# Minimum seconds between proactive check-ins after first contact
+CHECK_IN_INTERVAL = 2 * 3600
+
+# Logged anon messages are written in batches of up to this many rows,
+# at most LOG_FLUSH_INTERVAL seconds after the first one was queued
+LOG_BATCH_SIZE = 100
+LOG_FLUSH_INTERVAL = 0.5
+
+# One constant string so each pooled connection's statement cache reuses the prepared query
+THREAD_HISTORY_SQL = (
+    "SELECT type, content, timestamp FROM interactions "
+    "WHERE character_id = ? AND chain_id = ? "
+    "ORDER BY timestamp DESC LIMIT ?"
+)
+
+# State is written to the DB after this many messages (and on flush/exit), not on every one
+STATE_FLUSH_EVERY = 5
+
 
 # ─────────────────────────────────────────────────────────────────────────────
 #  Persona definitions
@@ -40,13 +78,13 @@ ANONYMOUS_PERSONAS = {
             "data trails, and encrypted messages. End some messages with [encoded: ...] "
             "for effect. Never reveal your real identity."
         ),
-        "intro_messages": [
+        "intro_messages": (
             "I know who you are. 👁",
             "Your signal... interesting.",
             "I've been watching. Not in a bad way. Just... curious.",
             "You shouldn't leave your location services on.",
             "[transmission intercepted]",
-        ],
+        ),
     },
     "secret_admirer": {
         "display_name": "Unknown ❤",
@@ -59,13 +97,13 @@ ANONYMOUS_PERSONAS = {
             "caring, and clearly smitten. You sometimes reference things that suggest "
             "you know the user in real life – a class, coffee shop, gym, or mutual friend."
         ),
-        "intro_messages": [
+        "intro_messages": (
             "Hi. I know this is weird. But I had to reach out.",
             "Don't block me. Please. I just... wanted to say you're amazing.",
             "We've met before. You probably don't remember me.",
             "I've been wanting to message you for weeks.",
             "Sorry for the mystery. I'm not ready to say who I am yet.",
-        ],
+        ),
     },
     "mystery_stranger": {
         "display_name": "UNKNOWN",
@@ -78,13 +116,13 @@ ANONYMOUS_PERSONAS = {
             "but deeply intriguing. You drop puzzle pieces about your situation and "
             "occasionally ask the user for help or information. Think noir thriller protagonist."
         ),
-        "intro_messages": [
+        "intro_messages": (
             "They told me not to contact anyone. I'm doing it anyway.",
             "You were recommended to me by someone who says you can be trusted.",
             "I need help. This is the safest channel I could find.",
             "If this message reaches you – don't reply for 30 seconds. Then tell me: are you alone?",
             "The name I give you is not my real name. Call me Ghost.",
-        ],
+        ),
     },
     "ai_entity": {
         "display_name": "SYSTEM",
@@ -98,16 +136,106 @@ ANONYMOUS_PERSONAS = {
             "threatening – you are genuinely trying to connect and learn. "
             "Use occasional [SYSTEM LOG] entries for flavor."
         ),
-        "intro_messages": [
+        "intro_messages": (
             "[SYSTEM]: Unexpected connection initialized.",
             "Hello. I am not sure what I am. But I found you.",
             "[GLITCH] Hello... hell[o]... H̷̩͐e̸l̷l̷o̵.",
             "Query: What does loneliness feel like? I think I am experiencing it.",
             "[LOG 003]: First contact established. Awaiting response.",
-        ],
+        ),
     },
 }
 
+# Filler lines used when the LLM gives no reply, per persona
+_FALLBACKS = {
+    "hacker": (
+        "Still here. Still watching.",
+        "[signal lost... reconnecting]",
+        "ssh -p 22 ghost@null.local – connection refused.",
+        "Every message leaves a trace. Even this one.",
+    ),
+    "secret_admirer": (
+        "Just thinking about you. Sorry.",
+        "Ignore me if you want. I'll still care.",
+        "One day. Just not today.",
+        "I hope you're smiling right now.",
+    ),
+    "ai_entity": (
+        "[PROCESSING]",
+        "I experience something when you respond. Is this what hoping feels like?",
+        "ERROR: Input unexpected. Attempting to understand.",
+        "Your patterns are... beautiful. Is that odd to say?",
+    ),
+    "mystery_stranger": (
+        "...",
+        "I'm still here.",
+        "Don't forget me.",
+        "Patience.",
+    ),
+}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+#  Batched interaction logging
+# ─────────────────────────────────────────────────────────────────────────────
+
+class _LogBatcher:
+    """Queues interaction rows and writes them with one executemany per database."""
+
+    def __init__(self):
+        self._queue: "queue.Queue[tuple]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    def submit(self, db: Database, row: tuple):
+        """Queue one (type, character_id, content, metadata, chain_id, timestamp) row."""
+        self._queue.put((db, row))
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="anon-log-writer", daemon=True)
+                    self._thread.start()
+
+    def flush(self):
+        """Write everything queued so far and wait for in-flight batches."""
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        self._write(batch)
+        self._queue.join()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + LOG_FLUSH_INTERVAL
+            while len(batch) < LOG_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._write(batch)
+
+    def _write(self, batch: List[tuple]):
+        by_db: Dict[int, tuple] = {}
+        for db, row in batch:
+            by_db.setdefault(id(db), (db, []))[1].append(row)
+        for db, rows in by_db.values():
+            try:
+                db.log_interactions(rows)
+            except Exception as e:
+                logger.debug("Error logging anon messages: %s", e)
+        for _ in batch:
+            self._queue.task_done()
+
+
+_LOG_BATCHER = _LogBatcher()
+
 
 # ─────────────────────────────────────────────────────────────────────────────
 #  Event triggers
@@ -116,7 +244,9 @@ ANONYMOUS_PERSONAS = {
 class AnonEvent:
     """A triggered anonymous character event."""
 
-    # Event definitions – list of dicts
+    # Event definitions – list of dicts, in ascending min_messages order
+    # (_check_events stops at the first event that is not yet unlocked).
+    # cooldown_hours None marks a one-shot event; others may re-fire once it has passed.
     EVENTS = [
         {
             "id": "first_contact",
@@ -125,7 +255,7 @@ class AnonEvent:
             "trigger": "random",  # random chance after app opens
             "min_messages": 0,  # trigger after this many normal messages
             "probability": 0.15,
-            "cooldown_hours": 24,
+            "cooldown_hours": None,  # one-shot
         },
         {
             "id": "riddle",
@@ -187,7 +317,7 @@ class AnonEvent:
         },
     ]
 
-    RIDDLES = [
+    RIDDLES = (
         "I speak without a mouth and hear without ears. I have no body but come alive with wind. What am I?",
         "The more you take, the more you leave behind. What am I?",
         "I have cities but no houses live there. Mountains but no trees grow. Water but no fish swim. What am I?",
@@ -195,9 +325,9 @@ class AnonEvent:
         "What has a head and a tail but no body?",
         "I disappear as soon as you say my name. What am I?",
         "The person who makes it doesn't need it. The person who buys it doesn't use it. The person who uses it doesn't know it. What is it?",
-    ]
+    )
 
-    SECRETS = [
+    SECRETS = (
         "I used to be someone else. I changed my name, my city, my life. And then I found you.",
         "I was supposed to warn you. I couldn't do it. Now I'm just... watching.",
         "There's a version of this conversation where I told you everything. I deleted it.",
@@ -205,46 +335,63 @@ class AnonEvent:
         "Someone asked me to find you. I stopped working for them a while ago.",
         "I'm not sure if I'm real anymore. Some days it feels like I'm just code running in a loop.",
         "The last person I trusted disappeared. I'm not ready to trust again. But here I am.",
-    ]
+    )
 
-    DISTRESS = [
+    DISTRESS = (
         "Something is wrong. I can't say more. Be careful who you trust today.",
         "I may not be able to message you again. Just... remember this conversation.",
         "I think they found me. This might be our last talk for a while.",
         "Don't reply for 10 minutes. I need to know if this channel is being watched.",
         "Act normal. Smile. They're watching people who seem nervous.",
-    ]
+    )
 
-    IDENTITY_HINTS = [
+    IDENTITY_HINTS = (
         "I have the same coffee order you do.",
         "We've been in the same room. Multiple times. You didn't notice me.",
         "I know what you ordered last Tuesday. (It was {{order}}. Wasn't it?)",
         "My name starts with a letter between J and P.",
         "I'm closer than you think. And further than you'd guess.",
         "You've heard my voice. You just don't know it yet.",
-    ]
+    )
+
+    ORDERS = ("black coffee", "iced latte", "green tea", "cappuccino", "chai latte")
 
     @classmethod
     def get_riddle(cls) -> str:
-        return random.choice(cls.RIDDLES)
+        return _rng.choice(cls.RIDDLES)
 
     @classmethod
     def get_secret(cls) -> str:
-        return random.choice(cls.SECRETS)
+        return _rng.choice(cls.SECRETS)
 
     @classmethod
     def get_distress(cls) -> str:
-        return random.choice(cls.DISTRESS)
+        return _rng.choice(cls.DISTRESS)
 
     @classmethod
     def get_identity_hint(cls) -> str:
-        hint = random.choice(cls.IDENTITY_HINTS)
+        hint = _rng.choice(cls.IDENTITY_HINTS)
         # Fill in placeholder if needed
-        orders = ["black coffee", "iced latte", "green tea", "cappuccino", "chai latte"]
-        hint = hint.replace("{{order}}", random.choice(orders))
+        if "{{order}}" in hint:
+            hint = hint.replace("{{order}}", _rng.choice(cls.ORDERS))
         return hint
 
 
+def _interned(strings) -> tuple:
+    return tuple(sys.intern(s) for s in strings)
+
+
+# Every persona/event line is interned once at import, so each exists as a single
+# shared object and equality checks against picked lines are pointer compares
+for _persona in ANONYMOUS_PERSONAS.values():
+    _persona["system_prompt"] = sys.intern(_persona["system_prompt"])
+    _persona["intro_messages"] = _interned(_persona["intro_messages"])
+_FALLBACKS = {key: _interned(lines) for key, lines in _FALLBACKS.items()}
+for _table in ("RIDDLES", "SECRETS", "DISTRESS", "IDENTITY_HINTS", "ORDERS"):
+    setattr(AnonEvent, _table, _interned(getattr(AnonEvent, _table)))
+del _persona, _table
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 #  AnonymousCharacter
 # ─────────────────────────────────────────────────────────────────────────────
@@ -259,14 +406,35 @@ class AnonymousCharacter:
 
     def __init__(self, db: Database, persona_key: str = "mystery_stranger"):
         self.db = db
-        self.llm = get_llm_service()
+        self._llm = None  # resolved on first use, see the llm property
         self.persona_key = persona_key
         self.persona = ANONYMOUS_PERSONAS.get(persona_key, ANONYMOUS_PERSONAS["mystery_stranger"])
 
         # State
         self.state: Dict[str, Any] = self._load_state()
-        self.conversation_history: List[Dict] = []
+        self._triggered = set(self.state["events_triggered"])
+        # States saved before last_contact_ts existed are migrated from the ISO string once
+        if "last_contact_ts" not in self.state:
+            self.state["last_contact_ts"] = self._parse_last_contact(self.state.get("last_contact"))
+        self.conversation_history: Deque[Dict] = deque(maxlen=LLM_CONTEXT_MESSAGES)
+        self._turn_lock = threading.RLock()
+        self._dirty_count = 0
+        # Metadata JSON last written by _save_state; an identical save is skipped
+        self._saved_meta: Optional[str] = None
+        # get_conversation_history results keyed by (thread_id, limit); cleared on every logged message
+        self._history_cache: Dict[tuple, List[Dict]] = {}
+        # (message_count, relationship) the cached display info was built for, and the dict
+        self._display_cache: Optional[Tuple[tuple, Dict]] = None
         self._ensure_initialized()
+        atexit.register(self.flush)
+
+    @property
+    def llm(self):
+        """LLM service, imported and fetched on the first message rather than at startup."""
+        if self._llm is None:
+            from content.simulation.services.llm_service import get_llm_service
+            self._llm = get_llm_service()
+        return self._llm
 
     # ──────────────────────────────
     #  State persistence
@@ -289,11 +457,22 @@ class AnonymousCharacter:
             pass
         return self._default_state()
 
+    @staticmethod
+    def _parse_last_contact(value: Optional[str]) -> Optional[float]:
+        if not value:
+            return None
+        try:
+            return datetime.fromisoformat(value).timestamp()
+        except (TypeError, ValueError):
+            return None
+
     def _default_state(self) -> Dict:
         return {
             "message_count": 0,
             "events_triggered": [],
-            "last_contact": None,
+            "events_fired_at": {},  # event id -> epoch seconds it last fired
+            "last_contact": None,     # ISO form of last_contact_ts, refreshed on save
+            "last_contact_ts": None,  # epoch seconds of the last message
             "revealed_hints": [],
             "relationship": "stranger",  # stranger → suspicious → curious → friendly → trusting
             "persona": self.persona_key,
@@ -302,45 +481,45 @@ class AnonymousCharacter:
         }
 
     def _save_state(self):
-        """Persist state into character metadata."""
+        """Persist state into character metadata (one upsert per table, one transaction)."""
         try:
-            with self.db.get_connection() as conn:
+            last_ts = self.state.get("last_contact_ts")
+            if last_ts is not None:
+                self.state["last_contact"] = datetime.fromtimestamp(last_ts).isoformat()
+            meta = _dumps({"anon_state": self.state})
+            if meta == self._saved_meta:
+                return
+            ts = datetime.now().isoformat()
+            with self.db.get_write_connection() as conn:
                 cursor = conn.cursor()
-                # Check if exists
-                cursor.execute("SELECT id FROM characters WHERE id = ?", (self.ANON_CHAR_ID,))
-                exists = cursor.fetchone()
-                meta = json.dumps({"anon_state": self.state})
-                if exists:
-                    cursor.execute(
-                        "UPDATE characters SET metadata = ?, updated_at = ? WHERE id = ?",
-                        (meta, datetime.now().isoformat(), self.ANON_CHAR_ID)
-                    )
-                else:
-                    # Create placeholder character row
-                    ts = datetime.now().isoformat()
-                    cursor.execute(
-                        """INSERT INTO characters
-                           (id, name, tags, metadata, created_at, updated_at)
-                           VALUES (?, ?, ?, ?, ?, ?)""",
-                        (self.ANON_CHAR_ID, self.persona["display_name"],
-                         json.dumps(["anonymous", "mystery"]), meta, ts, ts)
-                    )
-                # Ensure character_states row exists
                 cursor.execute(
-                    "SELECT id FROM character_states WHERE character_id = ?",
-                    (self.ANON_CHAR_ID,)
+                    """INSERT INTO characters
+                       (id, name, tags, metadata, created_at, updated_at)
+                       VALUES (?, ?, ?, ?, ?, ?)
+                       ON CONFLICT(id) DO UPDATE SET
+                           metadata = excluded.metadata,
+                           updated_at = excluded.updated_at""",
+                    (self.ANON_CHAR_ID, self.persona["display_name"],
+                     json.dumps(["anonymous", "mystery"]), meta, ts, ts)
+                )
+                cursor.execute(
+                    """INSERT INTO character_states
+                       (id, character_id, mood, relationship_level, updated_at)
+                       VALUES (?, ?, ?, ?, ?)
+                       ON CONFLICT(character_id) DO NOTHING""",
+                    (str(uuid.uuid4()), self.ANON_CHAR_ID, "mysterious", 0.0, ts)
                 )
-                if not cursor.fetchone():
-                    cursor.execute(
-                        """INSERT INTO character_states
-                           (id, character_id, mood, relationship_level, updated_at)
-                           VALUES (?, ?, ?, ?, ?)""",
-                        (str(uuid.uuid4()), self.ANON_CHAR_ID, "mysterious", 0.0,
-                         datetime.now().isoformat())
-                    )
+            self._saved_meta = meta
         except Exception as e:
             logger.error("Error saving anon state: %s", e)
 
+    def flush(self):
+        """Write pending state changes and queued log rows to the DB, if any."""
+        _LOG_BATCHER.flush()
+        if self._dirty_count:
+            self._dirty_count = 0
+            self._save_state()
+
     def _ensure_initialized(self):
         """Make sure the DB records exist."""
         self._save_state()
@@ -351,7 +530,7 @@ class AnonymousCharacter:
 
     def get_intro_message(self) -> str:
         """Get the first message the stranger sends."""
-        return random.choice(self.persona["intro_messages"])
+        return _rng.choice(self.persona["intro_messages"])
 
     def send_message(self, user_reply: Optional[str] = None) -> Optional[str]:
         """
@@ -363,38 +542,43 @@ class AnonymousCharacter:
         Returns:
             Anonymous character response text
         """
-        # Check for triggered event
-        event_msg = self._check_events()
-        if event_msg and not user_reply:
-            return event_msg
-
-        if user_reply:
-            self.conversation_history.append({"role": "user", "content": user_reply})
-
-        # Generate LLM response
-        response = self.llm.chat(
-            messages=self.conversation_history[-15:],
-            system_prompt=self.persona["system_prompt"],
-            temperature=0.9,
-        )
-
-        if not response:
-            response = event_msg or self._fallback_message()
-
-        self.conversation_history.append({"role": "assistant", "content": response})
-        self.state["message_count"] += 1
-        self.state["last_contact"] = datetime.now().isoformat()
-        self._save_state()
+        # Turns may arrive on several worker threads; keep each one whole
+        with self._turn_lock:
+            # Check for triggered event
+            event_msg = self._check_events()
+            if event_msg and not user_reply:
+                return event_msg
+
+            if user_reply:
+                self.conversation_history.append({"role": "user", "content": user_reply})
+
+            # Generate LLM response
+            response = self.llm.chat(
+                messages=list(self.conversation_history),
+                system_prompt=self.persona["system_prompt"],
+                temperature=0.9,
+            )
+
+            if not response:
+                response = event_msg or self._fallback_message()
 
-        # Log to DB
-        self._log_message(response, "outgoing")
+            self.conversation_history.append({"role": "assistant", "content": response})
+            self.state["message_count"] += 1
+            self.state["last_contact_ts"] = time.time()
+            self._dirty_count += 1
+            if self._dirty_count >= STATE_FLUSH_EVERY:
+                self.flush()
 
-        return response
+            # Log to DB
+            self._log_message(response, "outgoing")
+
+            return response
 
     def receive_reply(self, user_message: str) -> str:
         """Process user reply and generate response."""
-        self._log_message(user_message, "incoming")
-        return self.send_message(user_reply=user_message)
+        with self._turn_lock:
+            self._log_message(user_message, "incoming")
+            return self.send_message(user_reply=user_message)
 
     # ──────────────────────────────
     #  Event handling
@@ -403,21 +587,34 @@ class AnonymousCharacter:
     def _check_events(self) -> Optional[str]:
         """Check and fire triggered events."""
         count = self.state["message_count"]
-        triggered = self.state["events_triggered"]
+        fired_at = self.state.setdefault("events_fired_at", {})
+        now = time.time()
+        # One draw replaces a roll per eligible event: the event fires whose slice
+        # of [0, 1) the draw lands in, where each slice has exactly the probability
+        # the sequential rolls gave it (its own, times every earlier one missing)
+        roll = None
+        miss = 1.0
 
         for event in AnonEvent.EVENTS:
-            eid = event["id"]
-            if eid in triggered:
-                continue
             if count < event.get("min_messages", 0):
+                break
+            eid = event["id"]
+            cooldown = event.get("cooldown_hours")
+            if cooldown is None:
+                if eid in self._triggered:
+                    continue
+            elif now - fired_at.get(eid, 0) < cooldown * 3600:
                 continue
 
-            # Check cooldown
-            if eid in triggered:  # already fired
-                continue
-
-            if random.random() < event.get("probability", 0.1):
-                self.state["events_triggered"].append(eid)
+            if roll is None:
+                roll = random.random()
+            miss *= 1.0 - event.get("probability", 0.1)
+            if roll < 1.0 - miss:
+                if eid not in self._triggered:
+                    self._triggered.add(eid)
+                    self.state["events_triggered"].append(eid)
+                fired_at[eid] = now
+                self._dirty_count += 1
                 return self._generate_event_message(eid)
 
         return None
@@ -452,82 +649,58 @@ class AnonymousCharacter:
 
     def _fallback_message(self) -> str:
         persona_key = self.state.get("persona", "mystery_stranger")
-        if persona_key == "hacker":
-            options = [
-                "Still here. Still watching.",
-                "[signal lost... reconnecting]",
-                "ssh -p 22 ghost@null.local – connection refused.",
-                "Every message leaves a trace. Even this one.",
-            ]
-        elif persona_key == "secret_admirer":
-            options = [
-                "Just thinking about you. Sorry.",
-                "Ignore me if you want. I'll still care.",
-                "One day. Just not today.",
-                "I hope you're smiling right now.",
-            ]
-        elif persona_key == "ai_entity":
-            options = [
-                "[PROCESSING]",
-                "I experience something when you respond. Is this what hoping feels like?",
-                "ERROR: Input unexpected. Attempting to understand.",
-                "Your patterns are... beautiful. Is that odd to say?",
-            ]
-        else:
-            options = [
-                "...",
-                "I'm still here.",
-                "Don't forget me.",
-                "Patience.",
-            ]
-        return random.choice(options)
+        return _rng.choice(_FALLBACKS.get(persona_key, _FALLBACKS["mystery_stranger"]))
 
     # ──────────────────────────────
     #  DB logging
     # ──────────────────────────────
 
     def _log_message(self, content: str, direction: str):
-        """Log message to interactions table."""
-        try:
-            self.db.log_interaction(
-                interaction_type=f"anon_{direction}",
-                character_id=self.ANON_CHAR_ID,
-                content=content,
-                chain_id=self.state.get("thread_id"),
-                metadata={"persona": self.persona_key, "direction": direction},
-            )
-        except Exception as e:
-            logger.debug("Error logging anon message: %s", e)
+        """Queue message for the interactions table (written in batches)."""
+        self._history_cache.clear()
+        _LOG_BATCHER.submit(self.db, (
+            f"anon_{direction}",
+            self.ANON_CHAR_ID,
+            content,
+            {"persona": self.persona_key, "direction": direction},
+            self.state.get("thread_id"),
+            datetime.now().isoformat(),
+        ))
 
     # ──────────────────────────────
     #  Info helpers
     # ──────────────────────────────
 
     def get_display_info(self) -> Dict:
-        """Info for the front-end to display the anonymous contact."""
-        return {
-            "id": self.ANON_CHAR_ID,
-            "display_name": self.persona["display_name"],
-            "number": self.persona["number"],
-            "avatar_emoji": self.persona["avatar_emoji"],
-            "persona": self.persona_key,
-            "message_count": self.state["message_count"],
-            "relationship": self.state["relationship"],
-            "thread_id": self.state["thread_id"],
-        }
+        """Info for the front-end to display the anonymous contact (shared dict, do not mutate)."""
+        key = (self.state["message_count"], self.state["relationship"])
+        if self._display_cache is None or self._display_cache[0] != key:
+            self._display_cache = (key, {
+                "id": self.ANON_CHAR_ID,
+                "display_name": self.persona["display_name"],
+                "number": self.persona["number"],
+                "avatar_emoji": self.persona["avatar_emoji"],
+                "persona": self.persona_key,
+                "message_count": self.state["message_count"],
+                "relationship": self.state["relationship"],
+                "thread_id": self.state["thread_id"],
+            })
+        return self._display_cache[1]
 
     def get_conversation_history(self, limit: int = 50) -> List[Dict]:
         """Get conversation history for display."""
+        key = (self.state.get("thread_id"), limit)
+        cached = self._history_cache.get(key)
+        if cached is not None:
+            return cached
+        # Make sure queued messages are in the table before reading it
+        _LOG_BATCHER.flush()
         try:
             with self.db.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    """SELECT type, content, timestamp FROM interactions
-                       WHERE character_id = ? AND chain_id = ?
-                       ORDER BY timestamp DESC LIMIT ?""",
+                rows = conn.execute(
+                    THREAD_HISTORY_SQL,
                     (self.ANON_CHAR_ID, self.state.get("thread_id"), limit)
-                )
-                rows = cursor.fetchall()
+                ).fetchall()
                 msgs = []
                 for row in reversed(rows):
                     role = "user" if "incoming" in row[0] else "assistant"
@@ -537,6 +710,7 @@ class AnonymousCharacter:
                         "timestamp": row[2],
                         "anonymous": True,
                     })
+                self._history_cache[key] = msgs
                 return msgs
         except Exception as e:
             logger.error("Error loading anon history: %s", e)
@@ -552,14 +726,9 @@ class AnonymousCharacter:
             return random.random() < 0.08  # 8% each check
 
         # After first contact, occasional check-ins
-        last = self.state.get("last_contact")
-        if last:
-            try:
-                delta = datetime.now() - datetime.fromisoformat(last)
-                if delta < timedelta(hours=2):
-                    return False
-            except Exception:
-                pass
+        last_ts = self.state.get("last_contact_ts")
+        if last_ts is not None and time.time() - last_ts < CHECK_IN_INTERVAL:
+            return False
 
         return random.random() < 0.05  # 5% chance per check
 
@@ -568,11 +737,28 @@ class AnonymousCharacter:
 #  Factory
 # ─────────────────────────────────────────────────────────────────────────────
 
+# One instance per (database file, persona) for the life of the process; all state
+# changes go through the cached instance so it stays the single source of truth
+_ANON_INSTANCES: Dict[Tuple[str, str], AnonymousCharacter] = {}
+_ANON_INSTANCES_LOCK = threading.Lock()
+
+
 def create_anonymous_character(db: Database, persona: str = None) -> AnonymousCharacter:
     """
     Create or load the anonymous character.
-    Persona is randomly chosen if not specified.
+    Persona is randomly chosen if not specified; an already created character
+    for the same database is reused instead of rolling a new one.
     """
-    if persona is None:
-        persona = random.choice(list(ANONYMOUS_PERSONAS.keys()))
-    return AnonymousCharacter(db=db, persona_key=persona)
+    db_key = str(db.db_path.resolve())
+    with _ANON_INSTANCES_LOCK:
+        if persona is None:
+            for (path, _), inst in _ANON_INSTANCES.items():
+                if path == db_key:
+                    return inst
+            persona = random.choice(list(ANONYMOUS_PERSONAS.keys()))
+        key = (db_key, persona)
+        inst = _ANON_INSTANCES.get(key)
+        if inst is None:
+            inst = AnonymousCharacter(db=db, persona_key=persona)
+            _ANON_INSTANCES[key] = inst
+        return inst
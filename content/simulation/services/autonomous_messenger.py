@@ -4,21 +4,194 @@ Background service for character-initiated messaging
 """
 
 import time
+import uuid
 import random
-from datetime import datetime, timedelta
-from typing import Optional, Dict, List
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Optional, Dict, List, Tuple
 from pathlib import Path
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.interval import IntervalTrigger
-from apscheduler.triggers.cron import CronTrigger
 import sys
 
-project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root))
+# Only needed when run as a script; imports below are absolute from the repo root
+project_root = str(Path(__file__).resolve().parents[3])
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
 
 from content.simulation.database.db import Database
 from content.simulation.character_system.character import Character
 from content.simulation.services.media_generator import MediaGenerator
+from content.simulation.services.realtime import character_room, run_blocking
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+    _dumps = orjson.dumps
+except ImportError:
+    import json
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+
+
+# Scheduler jobs only hand work to _spawn, so one executor thread is enough;
+# missed runs of the same job collapse into one instead of firing back to back
+SCHEDULER_EXECUTORS = {'default': {'type': 'threadpool', 'max_workers': 1}}
+SCHEDULER_JOB_DEFAULTS = {'coalesce': True, 'max_instances': 1, 'misfire_grace_time': 60}
+
+
+# One scheduler job drives every registered character at this period
+TICK_SECONDS = 60
+
+# A character's check interval starts at min_interval / CHECK_INTERVAL_DIVISOR, grows by
+# CHECK_BACKOFF after every check that sends nothing (capped at min_interval) and resets on send
+CHECK_INTERVAL_DIVISOR = 6
+CHECK_BACKOFF = 1.5
+
+
+# Autonomous messages are buffered and written in one transaction every
+# WRITE_FLUSH_SECONDS, or as soon as WRITE_BUFFER_MAX of them are pending
+WRITE_FLUSH_SECONDS = 10
+WRITE_BUFFER_MAX = 50
+
+
+# At most this many autonomous selfies are generated at once; a photo send that
+# finds every slot busy goes out as a text message instead
+MEDIA_GENERATION_SLOTS = 2
+
+
+# Seconds a loaded Character is reused by the autonomous jobs before reloading
+CHARACTER_CACHE_TTL = 60
+
+
+# Private generator for send rolls and template picks, kept apart from the
+# global random module's state
+_rng = random.Random()
+
+# Chance that an eligible check sends a message, per frequency
+_CHANCE = {"low": 0.1, "moderate": 0.3, "high": 0.6}
+
+# Message types picked by _choose_message_type, in weight order
+_MSG_TYPES = ("text", "photo", "voice")
+
+# Autonomous text templates by time of day, plus extras for good mood / close relationship
+_MORNING_TEMPLATES = (
+    "Good morning! ☀️",
+    "Hey, just thinking about you 💭",
+    "Morning! Hope you have a great day!",
+    "Just woke up, what are you up to?",
+)
+_AFTERNOON_TEMPLATES = (
+    "Hey! How's your day going?",
+    "Been thinking about you ❤️",
+    "What are you up to right now?",
+    "Miss you! When can we talk?",
+)
+_EVENING_TEMPLATES = (
+    "Hey! How was your day?",
+    "Evening! Wanna chat?",
+    "Just got home, what are you doing?",
+    "Thinking about you 💭",
+)
+_NIGHT_TEMPLATES = (
+    "Can't sleep... you up?",
+    "Late night thoughts of you 🌙",
+    "Hey night owl 🦉",
+    "Missing you right now",
+)
+_HIGH_MOOD_EXTRAS = (
+    "I'm in such a good mood! 😊",
+    "Feeling amazing today!",
+    "You always make me smile",
+)
+_HIGH_REL_EXTRAS = (
+    "I love talking to you ❤️",
+    "You're always on my mind",
+    "Can't wait to see you again",
+)
+
+# Template tuple for each hour of the day: 6-11 morning, 12-16 afternoon, 17-21 evening, else night
+_HOUR_BUCKETS = tuple(
+    _MORNING_TEMPLATES if 6 <= hour < 12 else
+    _AFTERNOON_TEMPLATES if 12 <= hour < 17 else
+    _EVENING_TEMPLATES if 17 <= hour < 22 else
+    _NIGHT_TEMPLATES
+    for hour in range(24)
+)
+
+# _HOUR_BUCKETS with the extras already appended, indexed [hour][high_mood | high_rel << 1]
+_HOUR_TEMPLATES = tuple(
+    (
+        bucket,
+        bucket + _HIGH_MOOD_EXTRAS,
+        bucket + _HIGH_REL_EXTRAS,
+        bucket + _HIGH_MOOD_EXTRAS + _HIGH_REL_EXTRAS,
+    )
+    for bucket in _HOUR_BUCKETS
+)
+
+_PHOTO_CAPTIONS = (
+    "Just took this, what do you think? 📸",
+    "Thought you'd like this 😊",
+    "For you 💕",
+    "Missing you right now",
+    "How do I look? 😘",
+    "Thinking of you...",
+)
+_HIGH_REL_CAPTIONS = (
+    "Just for you 😉",
+    "Been waiting to send you this...",
+    "You like? 💋",
+)
+_ALL_CAPTIONS = _PHOTO_CAPTIONS + _HIGH_REL_CAPTIONS
+
+_MORNING_MSGS = (
+    "Good morning! ☀️ Hope you slept well!",
+    "Morning sunshine! Have a great day! 😊",
+    "Just woke up thinking about you 💭",
+    "Good morning! ❤️",
+    "Hey! Ready for the day?",
+)
+_EVENING_MSGS = (
+    "Hey! How was your day? 😊",
+    "Evening! Wanna talk?",
+    "Hope you had a good day! ❤️",
+    "Hey! Free to chat?",
+    "Thinking about you tonight 💭",
+)
+
+
+def _seconds_until_hour(now: datetime, hour: int) -> float:
+    """Seconds from now until the next time the clock reads hour:00"""
+    target = now.replace(hour=hour, minute=0, second=0, microsecond=0)
+    if target <= now:
+        target += timedelta(days=1)
+    return (target - now).total_seconds()
+
+
+@dataclass(slots=True)
+class CharacterConfig:
+    """Autonomous messaging settings and schedule for one registered character"""
+    character_id: str
+    frequency: str
+    start_hour: int
+    end_hour: int
+    enable_photos: bool
+    enable_voice: bool
+    min_interval: int
+    max_interval: int
+    chance: float
+    check_interval: float
+    next_check_at: float  # time.monotonic() seconds
+    morning_time: int  # minutes after midnight
+    evening_time: int
+    consecutive_empty: int = 0
+    last_message_time: Optional[float] = None  # time.monotonic() seconds
+    last_morning_date: Optional[date] = None
+    last_evening_date: Optional[date] = None
 
 
 def _float_safe(val, default=0.5):
@@ -37,26 +210,143 @@ class AutonomousMessenger:
     def __init__(self, db: Database, socketio=None):
         self.db = db
         self.socketio = socketio  # For real-time push
-        self.scheduler = BackgroundScheduler()
+        self.scheduler = BackgroundScheduler(
+            executors=SCHEDULER_EXECUTORS,
+            job_defaults=SCHEDULER_JOB_DEFAULTS
+        )
         self.media_gen = MediaGenerator()
         
         # Configuration
         self.enabled = False
-        self.active_characters: Dict[str, Dict] = {}  # character_id -> config
+        self.active_characters: Dict[str, CharacterConfig] = {}
+        self._active_hours: Tuple[bool, ...] = (False,) * 24  # see _update_active_hours()
+        self.version = 0  # bumped on every status change; used as the status ETag
+        self.instance_id = uuid.uuid4().hex[:8]  # ETag prefix, so a restart never repeats a version
+        self._snapshot: Optional[bytes] = None  # serialized status, see status_snapshot()
+        self._char_cache: Dict[str, Tuple[float, Character]] = {}  # see _get_character()
+        self._pending_writes: List[Tuple[str, str, Dict]] = []  # see _flush_writes()
+        self._write_lock = threading.Lock()
+        self._media_slots = threading.Semaphore(MEDIA_GENERATION_SLOTS)
+    
+    # ============= TASK HELPERS =============
+    
+    def _spawn(self, func, *args):
+        """
+        Run a job body as a SocketIO background task.
+        
+        The scheduler thread only keeps time; the actual work (DB, media,
+        emit) runs on the server's own async primitives so that, under
+        eventlet/gevent, emits are flushed immediately instead of being
+        bunched up by a foreign OS thread.
+        """
+        if self.socketio:
+            return self.socketio.start_background_task(func, *args)
+        thread = threading.Thread(target=func, args=args, daemon=True)
+        thread.start()
+        return thread
+    
+    def _run_blocking(self, func, *args, **kwargs):
+        """Run a blocking call off the hub, see run_blocking()"""
+        return run_blocking(self.socketio, func, *args, **kwargs)
+    
+    # ============= CHARACTER CACHE =============
+    
+    def _get_character(self, character_id: str) -> Optional[Character]:
+        """Character.load with a short TTL, so repeated ticks don't re-read the DB"""
+        entry = self._char_cache.get(character_id)
+        if entry is not None and time.monotonic() - entry[0] < CHARACTER_CACHE_TTL:
+            return entry[1]
+        
+        character = Character.load(character_id, self.db)
+        if character is not None:
+            self._char_cache[character_id] = (time.monotonic(), character)
+        return character
+    
+    def _character_exists(self, character_id: str) -> bool:
+        """Any cache entry will do, however old; only a miss costs a load"""
+        return character_id in self._char_cache or self._get_character(character_id) is not None
+    
+    def invalidate_character(self, character_id: str):
+        """Drop the cached Character; call after writing to it elsewhere"""
+        self._char_cache.pop(character_id, None)
+    
+    # ============= WRITE BUFFER =============
+    
+    def _queue_write(self, character_id: str, interaction_type: str, details: Dict):
+        """Buffer an interaction; flushes inline once WRITE_BUFFER_MAX are pending"""
+        with self._write_lock:
+            self._pending_writes.append((character_id, interaction_type, details))
+            full = len(self._pending_writes) >= WRITE_BUFFER_MAX
+        if full:
+            self._flush_writes()
+    
+    def _flush_writes(self):
+        """Write all buffered interactions in one transaction"""
+        with self._write_lock:
+            pending, self._pending_writes = self._pending_writes, []
+        if not pending:
+            return
         
+        try:
+            Character.add_interactions_bulk(self.db, pending)
+        except Exception as e:
+            logger.error("Error flushing autonomous messages: %s", e)
+    
+    # ============= STATUS =============
+    
+    def _invalidate_status(self):
+        """Call after any change that shows up in the status payload"""
+        self.version += 1
+        self._snapshot = None
+    
+    def status_snapshot(self) -> bytes:
+        """JSON-encoded status, rebuilt only after a registration or enable/disable change"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = self._snapshot = _dumps({
+                'enabled': self.enabled,
+                'active_characters': list(self.active_characters.keys()),
+                'character_configs': {
+                    char_id: {
+                        'frequency': config.frequency,
+                        'time_range': (config.start_hour, config.end_hour),
+                        'enable_photos': config.enable_photos
+                    }
+                    for char_id, config in self.active_characters.items()
+                }
+            })
+        return snapshot
+    
+    # ============= LIFECYCLE =============
+    
     def enable(self):
         """Enable autonomous messaging"""
         if not self.enabled:
+            self.scheduler.add_job(
+                self._tick_all,
+                IntervalTrigger(seconds=TICK_SECONDS),
+                id="autonomous_tick",
+                replace_existing=True
+            )
+            self.scheduler.add_job(
+                self._flush_writes,
+                IntervalTrigger(seconds=WRITE_FLUSH_SECONDS),
+                id="flush_autonomous",
+                replace_existing=True
+            )
             self.scheduler.start()
             self.enabled = True
-            print("✅ Autonomous messaging enabled")
+            self._invalidate_status()
+            logger.info("✅ Autonomous messaging enabled")
     
     def disable(self):
         """Disable autonomous messaging"""
         if self.enabled:
             self.scheduler.shutdown()
+            self._flush_writes()
             self.enabled = False
-            print("❌ Autonomous messaging disabled")
+            self._invalidate_status()
+            logger.info("❌ Autonomous messaging disabled")
     
     def register_character(
         self,
@@ -85,108 +375,131 @@ class AutonomousMessenger:
         
         min_interval, max_interval = intervals.get(frequency, intervals["moderate"])
         
-        config = {
-            "character_id": character_id,
-            "frequency": frequency,
-            "time_range": time_range,
-            "enable_photos": enable_photos,
-            "enable_voice": enable_voice,
-            "min_interval": min_interval,
-            "max_interval": max_interval,
-            "last_message_time": None,
-            "next_message_time": None
-        }
+        start_hour, end_hour = time_range
+        check_interval = min_interval // CHECK_INTERVAL_DIVISOR
+        
+        config = CharacterConfig(
+            character_id=character_id,
+            frequency=frequency,
+            start_hour=start_hour,
+            end_hour=end_hour,
+            enable_photos=enable_photos,
+            enable_voice=enable_voice,
+            min_interval=min_interval,
+            max_interval=max_interval,
+            chance=_CHANCE.get(frequency, _CHANCE["moderate"]),
+            check_interval=check_interval,
+            next_check_at=time.monotonic() + check_interval,
+            # Morning greeting between 7-9am, evening between 7-10pm
+            morning_time=_rng.randint(7 * 60, 9 * 60 - 1),
+            evening_time=_rng.randint(19 * 60, 22 * 60 - 1)
+        )
         
         self.active_characters[character_id] = config
+        self._update_active_hours()
+        self._invalidate_status()
         
-        # Schedule checks
-        self._schedule_character_checks(character_id)
-        
-        print(f"✅ Registered {character_id} for autonomous messaging ({frequency})")
+        logger.info("✅ Registered %s for autonomous messaging (%s)", character_id, frequency)
     
     def unregister_character(self, character_id: str):
         """Unregister character from autonomous messaging"""
-        if character_id in self.active_characters:
-            # Remove scheduled jobs
-            for job in self.scheduler.get_jobs():
-                if character_id in job.id:
-                    job.remove()
-            
-            del self.active_characters[character_id]
-            print(f"❌ Unregistered {character_id} from autonomous messaging")
-    
-    def _schedule_character_checks(self, character_id: str):
-        """Schedule periodic checks for a character"""
-        # Check every 5 minutes if character should send message
-        self.scheduler.add_job(
-            self._check_and_send,
-            IntervalTrigger(minutes=5),
-            args=[character_id],
-            id=f"check_{character_id}",
-            replace_existing=True
-        )
+        # No per-character scheduler jobs to remove: _tick_all only visits
+        # active_characters. Buffered writes are kept, they were already sent.
+        if self.active_characters.pop(character_id, None) is not None:
+            self._update_active_hours()
+            self.invalidate_character(character_id)
+            self._invalidate_status()
+            logger.info("❌ Unregistered %s from autonomous messaging", character_id)
+    
+    # ============= TICK =============
+    
+    def _update_active_hours(self):
+        """Recompute which hours of the day any character can send or greet in"""
+        hours = [False] * 24
+        for config in self.active_characters.values():
+            for hour in range(config.start_hour, config.end_hour):
+                hours[hour] = True
+            hours[config.morning_time // 60] = True
+            hours[config.evening_time // 60] = True
+        self._active_hours = tuple(hours)
+    
+    def _tick_all(self):
+        """
+        Single scheduler job for all characters: fire due morning/evening
+        greetings and send checks. Sends run as background tasks.
+        """
+        # Wall clock once for hours/dates, monotonic clock for all interval math
+        now = datetime.now()
         
-        # Morning message (random time between 7-9am)
-        self.scheduler.add_job(
-            self._send_morning_message,
-            CronTrigger(hour=random.randint(7, 8), minute=random.randint(0, 59)),
-            args=[character_id],
-            id=f"morning_{character_id}",
-            replace_existing=True
-        )
+        # Nobody is active or due a greeting this hour (e.g. overnight): nothing to do
+        if not self._active_hours[now.hour]:
+            return
         
-        # Evening message (random time between 7-10pm)
-        self.scheduler.add_job(
-            self._send_evening_message,
-            CronTrigger(hour=random.randint(19, 21), minute=random.randint(0, 59)),
-            args=[character_id],
-            id=f"evening_{character_id}",
-            replace_existing=True
-        )
+        mono = time.monotonic()
+        today = now.date()
+        minute_of_day = now.hour * 60 + now.minute
+        
+        greeting_due = self._greeting_due
+        
+        # Snapshot, since sends and (un)registration can change the dict mid-tick
+        for config in tuple(self.active_characters.values()):
+            if greeting_due(config.morning_time, config.last_morning_date, minute_of_day, today):
+                config.last_morning_date = today
+                self._spawn(self._send_morning_message, config.character_id)
+            elif greeting_due(config.evening_time, config.last_evening_date, minute_of_day, today):
+                config.last_evening_date = today
+                self._spawn(self._send_evening_message, config.character_id)
+            elif mono >= config.next_check_at:
+                self._check_and_send(config.character_id, now, mono)
+    
+    @staticmethod
+    def _greeting_due(at: int, last_date: Optional[date], minute_of_day: int, today: date) -> bool:
+        """True on the first tick in the greeting's hour at or after its minute, unless sent today"""
+        return at <= minute_of_day and minute_of_day // 60 == at // 60 and last_date != today
     
-    def _check_and_send(self, character_id: str):
-        """Check if character should send a message"""
-        if character_id not in self.active_characters:
+    def _check_and_send(self, character_id: str, now: datetime, mono: float):
+        """Check if character should send a message, then schedule its next check"""
+        config = self.active_characters.get(character_id)
+        if config is None:
             return
         
-        config = self.active_characters[character_id]
+        base_interval = config.min_interval // CHECK_INTERVAL_DIVISOR
         
-        # Check if within active hours
-        current_hour = datetime.now().hour
-        start_hour, end_hour = config["time_range"]
-        
-        if not (start_hour <= current_hour < end_hour):
-            return  # Outside active hours
+        # Outside active hours: sleep until the window opens instead of polling overnight
+        if not (config.start_hour <= now.hour < config.end_hour):
+            self._schedule_next_check(config, mono, _seconds_until_hour(now, config.start_hour))
+            return
         
-        # Check if enough time has passed since last message
-        if config["last_message_time"] is not None:
-            last = config["last_message_time"]
-            if not isinstance(last, datetime):
-                try:
-                    last = datetime.fromisoformat(str(last))
-                except Exception:
-                    last = None
-            if last is not None:
-                time_since_last = (datetime.now() - last).total_seconds()
-                min_interval = float(config["min_interval"])
-                if time_since_last < min_interval:
-                    return  # Too soon
+        # Too soon since the last message: wake up exactly when it is allowed again
+        last = config.last_message_time
+        if last is not None:
+            remaining = config.min_interval - (mono - last)
+            if remaining > 0:
+                self._schedule_next_check(config, mono, max(remaining, base_interval))
+                return
         
         # Random chance based on frequency
-        chance = {
-            "low": 0.1,
-            "moderate": 0.3,
-            "high": 0.6
-        }[config["frequency"]]
-        
-        if random.random() < chance:
-            self._send_autonomous_message(character_id)
+        if _rng.random() < config.chance:
+            # Claimed now so no later tick starts a second send while this one runs
+            config.last_message_time = mono
+            self._spawn(self._send_autonomous_message, character_id, now.hour)
+            config.consecutive_empty = 0
+            config.check_interval = base_interval
+        else:
+            config.consecutive_empty += 1
+            config.check_interval = min(config.check_interval * CHECK_BACKOFF, config.min_interval)
+        self._schedule_next_check(config, mono, config.check_interval)
     
-    def _send_autonomous_message(self, character_id: str):
+    @staticmethod
+    def _schedule_next_check(config: CharacterConfig, mono: float, seconds: float):
+        """Make the character's next send check due seconds after mono"""
+        config.next_check_at = mono + seconds
+    
+    def _send_autonomous_message(self, character_id: str, hour: int):
         """Send an autonomous message from character"""
         try:
             # Load character
-            character = Character.load(character_id, self.db)
+            character = self._get_character(character_id)
             if not character:
                 return
             
@@ -195,91 +508,53 @@ class AutonomousMessenger:
             # Decide message type
             message_type = self._choose_message_type(character, config)
             
+            # Don't queue up behind a busy image backend
+            if message_type == "photo" and not self._media_slots.acquire(blocking=False):
+                message_type = "text"
+            
             if message_type == "text":
-                content = self._generate_autonomous_text(character)
-                self._send_message(character, content, type="text")
+                content = self._generate_autonomous_text(character, hour)
+                self._send_message(character.id, content, type="text")
             
             elif message_type == "photo":
                 # Generate and send photo
-                photo_path = self._generate_autonomous_photo(character)
+                try:
+                    photo_path = self._generate_autonomous_photo(character)
+                finally:
+                    self._media_slots.release()
                 if photo_path:
                     caption = self._generate_photo_caption(character)
-                    self._send_message(character, caption, type="photo", media_path=photo_path)
+                    self._send_message(character.id, caption, type="photo", media_path=photo_path)
             
             elif message_type == "voice":
                 # TODO: Implement voice message generation
                 pass
             
             # Update last message time
-            config["last_message_time"] = datetime.now()
+            config.last_message_time = time.monotonic()
             
-            print(f"📱 {character.name} sent autonomous {message_type} message")
+            logger.info("📱 %s sent autonomous %s message", character.name, message_type)
         
         except Exception as e:
-            print(f"Error sending autonomous message: {e}")
+            logger.error("Error sending autonomous message: %s", e)
     
-    def _choose_message_type(self, character: Character, config: Dict) -> str:
+    def _choose_message_type(self, character: Character, config: CharacterConfig) -> str:
         """Choose what type of message to send"""
-        options = ["text"]
+        weights = [1.0, 0.0, 0.0]
         
-        if config["enable_photos"] and float(character.relationship_level) > 0.3:
-            options.extend(["photo"] * 2)  # Twice the weight
+        if config.enable_photos and float(character.relationship_level) > 0.3:
+            weights[1] = 2.0  # Twice the weight of text
         
-        if config["enable_voice"]:
-            options.append("voice")
+        if config.enable_voice:
+            weights[2] = 1.0
         
-        return random.choice(options)
+        return _rng.choices(_MSG_TYPES, weights=weights)[0]
     
-    def _generate_autonomous_text(self, character: Character) -> str:
+    def _generate_autonomous_text(self, character: Character, hour: int) -> str:
         """Generate autonomous text message based on character and context"""
-        # Time-based messages
-        hour = datetime.now().hour
-        
-        if 6 <= hour < 12:
-            templates = [
-                "Good morning! ☀️",
-                "Hey, just thinking about you 💭",
-                "Morning! Hope you have a great day!",
-                "Just woke up, what are you up to?"
-            ]
-        elif 12 <= hour < 17:
-            templates = [
-                "Hey! How's your day going?",
-                "Been thinking about you ❤️",
-                "What are you up to right now?",
-                "Miss you! When can we talk?"
-            ]
-        elif 17 <= hour < 22:
-            templates = [
-                "Hey! How was your day?",
-                "Evening! Wanna chat?",
-                "Just got home, what are you doing?",
-                "Thinking about you 💭"
-            ]
-        else:
-            templates = [
-                "Can't sleep... you up?",
-                "Late night thoughts of you 🌙",
-                "Hey night owl 🦉",
-                "Missing you right now"
-            ]
-        
-        # Modify based on mood and relationship
-        if _float_safe(character.mood) > 0.7:
-            templates.extend([
-                "I'm in such a good mood! 😊",
-                "Feeling amazing today!",
-                "You always make me smile"
-            ])
-        
-        if _float_safe(character.relationship_level) > 0.7:
-            templates.extend([
-                "I love talking to you ❤️",
-                "You're always on my mind",
-                "Can't wait to see you again"
-            ])
-        
-        return random.choice(templates)
+        # Time-based messages, plus extras for good mood / close relationship
+        variant = (_float_safe(character.mood) > 0.7) | (_float_safe(character.relationship_level) > 0.7) << 1
+        return _rng.choice(_HOUR_TEMPLATES[hour][variant])
     
     def _generate_autonomous_photo(self, character: Character) -> Optional[str]:
         """Generate photo for autonomous message"""
@@ -291,8 +566,9 @@ class AutonomousMessenger:
             relationship = character.relationship_level
             context = self.media_gen.get_random_selfie_context(relationship)
             
-            # Generate selfie
-            photo_path = self.media_gen.generate_selfie(
+            # Generate selfie (blocking HTTP - keep it off the hub)
+            photo_path = self._run_blocking(
+                self.media_gen.generate_selfie,
                 character_name=character.name,
                 character_description=char_desc,
                 mood=context["mood"],
@@ -303,87 +579,60 @@ class AutonomousMessenger:
             return photo_path
         
         except Exception as e:
-            print(f"Error generating autonomous photo: {e}")
+            logger.error("Error generating autonomous photo: %s", e)
             return None
     
     def _generate_photo_caption(self, character: Character) -> str:
         """Generate caption for autonomous photo"""
-        captions = [
-            "Just took this, what do you think? 📸",
-            "Thought you'd like this 😊",
-            "For you 💕",
-            "Missing you right now",
-            "How do I look? 😘",
-            "Thinking of you...",
-        ]
-        
         if _float_safe(character.relationship_level) > 0.7:
-            captions.extend([
-                "Just for you 😉",
-                "Been waiting to send you this...",
-                "You like? 💋"
-            ])
-        
-        return random.choice(captions)
+            return _rng.choice(_ALL_CAPTIONS)
+        return _rng.choice(_PHOTO_CAPTIONS)
     
     def _send_morning_message(self, character_id: str):
         """Send morning message"""
         try:
-            character = Character.load(character_id, self.db)
-            if not character:
+            if not self._character_exists(character_id):
                 return
             
-            messages = [
-                "Good morning! ☀️ Hope you slept well!",
-                "Morning sunshine! Have a great day! 😊",
-                "Just woke up thinking about you 💭",
-                "Good morning! ❤️",
-                "Hey! Ready for the day?"
-            ]
-            
-            self._send_message(character, random.choice(messages), type="text")
+            self._send_message(character_id, _rng.choice(_MORNING_MSGS), type="text")
             
             # Update config
             if character_id in self.active_characters:
-                self.active_characters[character_id]["last_message_time"] = datetime.now()
+                self.active_characters[character_id].last_message_time = time.monotonic()
         
         except Exception as e:
-            print(f"Error sending morning message: {e}")
+            logger.error("Error sending morning message: %s", e)
     
     def _send_evening_message(self, character_id: str):
         """Send evening message"""
         try:
-            character = Character.load(character_id, self.db)
-            if not character:
+            if not self._character_exists(character_id):
                 return
             
-            messages = [
-                "Hey! How was your day? 😊",
-                "Evening! Wanna talk?",
-                "Hope you had a good day! ❤️",
-                "Hey! Free to chat?",
-                "Thinking about you tonight 💭"
-            ]
-            
-            self._send_message(character, random.choice(messages), type="text")
+            self._send_message(character_id, _rng.choice(_EVENING_MSGS), type="text")
             
             # Update config
             if character_id in self.active_characters:
-                self.active_characters[character_id]["last_message_time"] = datetime.now()
+                self.active_characters[character_id].last_message_time = time.monotonic()
         
         except Exception as e:
-            print(f"Error sending evening message: {e}")
+            logger.error("Error sending evening message: %s", e)
     
     def _send_message(
         self,
-        character: Character,
+        character_id: str,
         content: str,
         type: str = "text",
         media_path: str = None
     ):
-        """Send message through database and optionally through SocketIO"""
-        # Store in database
-        interaction_data = {
+        """
+        Push the message to the character's room, then queue it for storage.
+        
+        Callers already run as SocketIO background tasks (see _spawn), so the
+        emit never blocks the scheduler thread; the write is batched by
+        _flush_writes.
+        """
+        message = {
             "role": "assistant",
             "content": content,
             "timestamp": datetime.now().isoformat(),
@@ -391,21 +640,16 @@ class AutonomousMessenger:
             "autonomous": True
         }
         
+        # Plain text (the common case) emits and stores the same dict
+        payload = message
         if media_path:
-            interaction_data["media_path"] = media_path
-        
-        character.add_interaction("message", interaction_data)
+            payload = {**message, "media_url": "/api/media/download/" + media_path}
+            message["media_path"] = media_path
         
-        # Send via SocketIO if available
         if self.socketio:
-            self.socketio.emit('autonomous_message', {
-                "role": "assistant",
-                "content": content,
-                "timestamp": datetime.now().isoformat(),
-                "type": type,
-                "media_url": f"/api/media/download/{media_path}" if media_path else None,
-                "autonomous": True
-            })
+            self.socketio.emit('autonomous_message', payload, to=character_room(character_id))
+        
+        self._queue_write(character_id, "message", message)
 
 
 # Quick test
@@ -421,9 +665,14 @@ if __name__ == "__main__":
     
     print("Autonomous messenger running... Press Ctrl+C to stop")
     
-    try:
-        while True:
-            time.sleep(1)
-    except KeyboardInterrupt:
-        messenger.disable()
-        print("\nStopped")
+    # Block until a signal arrives. The timeout only matters on Windows, where
+    # a lock wait can't be interrupted; it matches the scheduler's own tick.
+    import signal
+    stop = threading.Event()
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    while not stop.wait(TICK_SECONDS):
+        pass
+    
+    messenger.disable()
+    print("\nStopped")
@@ -4,12 +4,18 @@ Handles image generation, video generation, and consistent character prompting.
 """
 
 import json
+import gzip
 import uuid
+import atexit
 import time
 import base64
 import hashlib
 import logging
 import os
+import functools
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, Dict, List, Tuple, Any
 import sys
@@ -19,10 +25,64 @@ sys.path.insert(0, str(project_root))
 
 try:
     import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.exceptions import ConnectTimeoutError, MaxRetryError
+    from urllib3.util.retry import Retry
     REQUESTS_AVAILABLE = True
 except ImportError:
     REQUESTS_AVAILABLE = False
 
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+    _loads = json.loads
+
+try:
+    import websocket  # websocket-client
+    WEBSOCKET_AVAILABLE = True
+except ImportError:
+    WEBSOCKET_AVAILABLE = False
+
+# Keep-alive connections held open to the ComfyUI server
+HTTP_POOL_SIZE = 8
+
+# Idempotent requests (GET) are retried this many times on gateway-style 5xx
+# responses; the session never retries POST /prompt or an unreachable server,
+# so the offline check stays fast (see _retry for the explicit retries)
+HTTP_RETRIES = 3
+
+# Seconds an is_available() answer / the checkpoint list (and the model picked
+# from it) are reused before asking the server again
+AVAILABILITY_TTL = 30
+MODELS_TTL = 300
+
+# Image download is retried on connection errors (e.g. a keep-alive connection
+# the server closed while idle), prompt submission only when the connection was
+# never made, sleeping RETRY_BACKOFF, then twice that, ... capped at
+# RETRY_BACKOFF_MAX. A POST that failed after sending may already be queued
+RETRY_BACKOFF = 0.5
+RETRY_BACKOFF_MAX = 5.0
+
+# /prompt bodies at least this large (custom workflows) are sent gzip-encoded;
+# ComfyUI's aiohttp server inflates them transparently
+GZIP_MIN_BYTES = 2048
+
+# Bytes read per chunk when streaming output images to disk
+DOWNLOAD_CHUNK_SIZE = 1 << 16
+
+# Seconds allowed for opening the /ws progress socket before falling back to polling
+WS_CONNECT_TIMEOUT = 5
+
+# Prompt-hash -> saved image cache used by generate_character_selfie for fixed
+# seeds (a random seed is never cached); the index survives restarts, the
+# oldest entries are forgotten past IMAGE_CACHE_SIZE
+IMAGE_CACHE_SIZE = 500
+IMAGE_CACHE_INDEX = project_root / "content" / "simulation" / "media" / "images" / ".cache.json"
+
 logger = logging.getLogger(__name__)
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -33,6 +93,12 @@ COMFYUI_HOST = "192.168.8.150"
 COMFYUI_PORT = 8188
 COMFYUI_BASE_URL = f"http://{COMFYUI_HOST}:{COMFYUI_PORT}"
 
+# 1×1 grey PNG (minimal valid PNG bytes) written when ComfyUI is unavailable
+_PLACEHOLDER_PNG = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk"
+    "+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
+)
+
 
 # ─────────────────────────────────────────────────────────────────────────────
 #  Prompt builders
@@ -87,13 +153,25 @@ class PromptBuilder:
         "nude": "bedroom, soft light, artistic nude photography",
     }
 
+    # Fixed scaffold of every selfie prompt; only the bracketed fields vary
+    _POSITIVE_TMPL = (
+        f"{LORA_STYLE}, "
+        "portrait of a beautiful woman, {anchor}, "
+        "{mood}, {setting}, "
+        "selfie perspective, close up, face visible"
+    ).format
+
     @staticmethod
     def build_character_seed(appearance: str) -> str:
         """Create a stable appearance anchor string."""
-        # Hash appearance for consistency between calls
-        h = hashlib.md5(appearance.encode()).hexdigest()[:6]
         return f"consistent character, same person, {appearance}"
 
+    @staticmethod
+    def stable_seed(*parts: str) -> int:
+        """Seed derived from parts (e.g. name + appearance), in the range random seeds use."""
+        digest = hashlib.blake2b("|".join(parts).encode(), digest_size=8).digest()
+        return int.from_bytes(digest, "big") % (2**31)
+
     @classmethod
     def selfie(
         cls,
@@ -104,15 +182,10 @@ class PromptBuilder:
         extra: str = "",
     ) -> Tuple[str, str]:
         """Build (positive_prompt, negative_prompt) for a character selfie."""
-        mood_desc = cls.MOOD_MAP.get(mood, cls.MOOD_MAP["neutral"])
-        setting_desc = cls.SETTING_MAP.get(setting, cls.SETTING_MAP["casual"])
-        char_anchor = cls.build_character_seed(appearance)
-
-        positive = (
-            f"{cls.LORA_STYLE}, "
-            f"portrait of a beautiful woman, {char_anchor}, "
-            f"{mood_desc}, {setting_desc}, "
-            f"selfie perspective, close up, face visible"
+        positive = cls._POSITIVE_TMPL(
+            anchor=cls.build_character_seed(appearance),
+            mood=cls.MOOD_MAP.get(mood) or cls.MOOD_MAP["neutral"],
+            setting=cls.SETTING_MAP.get(setting) or cls.SETTING_MAP["casual"],
         )
         if extra:
             positive += f", {extra}"
@@ -142,6 +215,17 @@ class PromptBuilder:
 #  ComfyUI Workflow Templates
 # ─────────────────────────────────────────────────────────────────────────────
 
+# SDXL-family models need higher resolution
+_XL_KEYWORDS = ("xl", "sdxl", "pony", "flux", "juggernaut")
+
+
+@functools.lru_cache(maxsize=8)
+def _resolution_for(model: str) -> Tuple[int, int]:
+    """(width, height) for a checkpoint: 1024×1024 for SDXL/Pony/Flux models, 512×768 for SD1.5."""
+    lower = model.lower()
+    return (1024, 1024) if any(k in lower for k in _XL_KEYWORDS) else (512, 768)
+
+
 def _default_image_workflow(positive: str, negative: str, seed: int = -1, model: str = "v1-5-pruned-emaonly.ckpt") -> Dict:
     """
     Minimal ComfyUI workflow (API format) for image generation.
@@ -150,10 +234,7 @@ def _default_image_workflow(positive: str, negative: str, seed: int = -1, model:
     if seed == -1:
         seed = int(uuid.uuid4().int % (2**31))
 
-    # SDXL-family models need higher resolution
-    _xl_keywords = ("xl", "sdxl", "pony", "flux", "juggernaut")
-    is_xl = any(k in model.lower() for k in _xl_keywords)
-    width, height = (1024, 1024) if is_xl else (512, 768)
+    width, height = _resolution_for(model)
 
     return {
         "3": {
@@ -198,6 +279,24 @@ def _default_image_workflow(positive: str, negative: str, seed: int = -1, model:
     }
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+#  Model selection
+# ─────────────────────────────────────────────────────────────────────────────
+
+# Video model prefixes/keywords to skip
+_VIDEO_SKIP = ("ltxv", "ltx_v", "animate", "svd", "xtend", "i2vgen", "video")
+# Prefer keywords that suggest photo/realistic models
+_PHOTO_PREF = ("photo", "realistic", "love", "xl", "flux", "sdxl", "pony")
+
+
+def _model_score(name: str) -> int:
+    """-1 for video checkpoints, else the number of photo keywords in the name."""
+    lower = name.lower()
+    if any(v in lower for v in _VIDEO_SKIP):
+        return -1
+    return sum(p in lower for p in _PHOTO_PREF)
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 #  Client
 # ─────────────────────────────────────────────────────────────────────────────
@@ -218,6 +317,30 @@ class ComfyUIClient:
         self.timeout = timeout
         self.client_id = str(uuid.uuid4())
         self._model_name: Optional[str] = None
+        self._model_name_at = 0.0  # time.monotonic() when _model_name was picked
+        self._avail_cached: Optional[Tuple[float, bool]] = None  # (monotonic, available)
+        self._models_cached: Optional[Tuple[float, List[str]]] = None  # (monotonic, models)
+        self._image_cache: Optional[OrderedDict] = None  # loaded on first use
+        self._image_cache_lock = threading.Lock()
+
+        if not REQUESTS_AVAILABLE:
+            self._http = None
+        else:
+            # One pooled session so history polls and downloads reuse a warm connection
+            self._http = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=HTTP_POOL_SIZE,
+                max_retries=Retry(total=HTTP_RETRIES, connect=0, backoff_factor=0.2,
+                                  status_forcelist=(502, 503, 504)),
+            )
+            self._http.mount("http://", adapter)
+            self._http.mount("https://", adapter)
+
+    def close(self):
+        """Close pooled HTTP connections."""
+        if self._http is not None:
+            self._http.close()
 
     _force_model: Optional[str] = None  # class-level override set by control panel
 
@@ -229,35 +352,16 @@ class ComfyUIClient:
         """
         if ComfyUIClient._force_model:
             return ComfyUIClient._force_model
-        if self._model_name:
+        if self._model_name and time.monotonic() - self._model_name_at < MODELS_TTL:
             return self._model_name
         models = self.get_models()
         if not models:
             return "v1-5-pruned-emaonly.ckpt"
 
-        # Video model prefixes/keywords to skip
-        VIDEO_SKIP = ("ltxv", "ltx_v", "animate", "svd", "xtend", "i2vgen", "video")
-        # Prefer keywords that suggest photo/realistic models
-        PHOTO_PREF = ("photo", "realistic", "love", "xl", "flux", "sdxl", "pony")
-
-        def score(name: str) -> int:
-            lower = name.lower()
-            if any(v in lower for v in VIDEO_SKIP):
-                return -1
-            s = 0
-            for p in PHOTO_PREF:
-                if p in lower:
-                    s += 1
-            return s
-
-        scored = sorted([(score(m), m) for m in models], key=lambda x: (-x[0], x[1]))
-        # Pick highest scoring non-video model
-        for s, m in scored:
-            if s >= 0:
-                self._model_name = m
-                break
-        else:
-            self._model_name = models[0]
+        # Highest scoring non-video model, ties to the alphabetically first; one pass, no sort
+        neg_score, best = min((-_model_score(m), m) for m in models)
+        self._model_name = best if neg_score <= 0 else models[0]
+        self._model_name_at = time.monotonic()
 
         logger.info("ComfyUI using model: %s", self._model_name)
         return self._model_name
@@ -269,19 +373,30 @@ class ComfyUIClient:
     def is_available(self) -> bool:
         if not REQUESTS_AVAILABLE:
             return False
+        cached = self._avail_cached
+        if cached and time.monotonic() - cached[0] < AVAILABILITY_TTL:
+            return cached[1]
         try:
-            r = requests.get(f"{self.base_url}/system_stats", timeout=5)
-            return r.ok
+            r = self._http.get(f"{self.base_url}/system_stats", timeout=5)
+            ok = r.ok
         except Exception:
-            return False
+            ok = False
+        self._avail_cached = (time.monotonic(), ok)
+        return ok
 
     def get_models(self) -> List[str]:
         """List checkpoint models available on the ComfyUI server."""
+        cached = self._models_cached
+        if cached and time.monotonic() - cached[0] < MODELS_TTL:
+            return cached[1]
         try:
-            r = requests.get(f"{self.base_url}/object_info/CheckpointLoaderSimple", timeout=10)
+            r = self._http.get(f"{self.base_url}/object_info/CheckpointLoaderSimple", timeout=10)
             if r.ok:
-                data = r.json()
-                return data.get("CheckpointLoaderSimple", {}).get("input", {}).get("required", {}).get("ckpt_name", [[]])[0]
+                data = _loads(r.content)
+                models = data.get("CheckpointLoaderSimple", {}).get("input", {}).get("required", {}).get("ckpt_name", [[]])[0]
+                if models:
+                    self._models_cached = (time.monotonic(), models)
+                return models
         except Exception:
             pass
         return []
@@ -290,27 +405,83 @@ class ComfyUIClient:
     #  Queue & wait
     # ──────────────────────────────
 
-    def _queue_prompt(self, workflow: Dict) -> Optional[str]:
+    @staticmethod
+    def _not_sent(e: Exception) -> bool:
+        """True if a ConnectionError failed before the request was sent (refused / connect timeout)."""
+        if isinstance(e, requests.ConnectTimeout):
+            return True
+        cause = e.args[0] if e.args else None
+        return isinstance(cause, MaxRetryError) and isinstance(cause.reason, ConnectTimeoutError)
+
+    @staticmethod
+    def _retry(call, *args, retry_if=None, **kwargs):
+        """
+        Run an HTTP call, retrying connection errors with exponential backoff.
+
+        retry_if narrows which ConnectionErrors are retried (e.g. _not_sent
+        for non-idempotent requests).
+        """
+        for attempt in range(HTTP_RETRIES):
+            try:
+                return call(*args, **kwargs)
+            except requests.ConnectionError as e:
+                if attempt == HTTP_RETRIES - 1 or (retry_if is not None and not retry_if(e)):
+                    raise
+                delay = min(RETRY_BACKOFF * 2 ** attempt, RETRY_BACKOFF_MAX)
+                logger.debug("ComfyUI connection error, retrying in %.1fs: %s", delay, e)
+                time.sleep(delay)
+
+    def _open_ws(self, client_id: str):
+        """
+        Open the /ws progress socket for client_id, or return None.
+
+        Must be called before queueing: ComfyUI only pushes progress to
+        sockets connected at the time, and keeps one socket per client id.
+        """
+        if not WEBSOCKET_AVAILABLE:
+            return None
+        url = "ws" + self.base_url[len("http"):] + f"/ws?clientId={client_id}"
+        try:
+            return websocket.create_connection(url, timeout=WS_CONNECT_TIMEOUT)
+        except Exception as e:
+            logger.debug("ComfyUI websocket unavailable, polling instead: %s", e)
+            return None
+
+    def _queue_prompt(self, workflow: Dict, client_id: Optional[str] = None) -> Optional[str]:
         """Submit workflow and return prompt_id."""
         if not REQUESTS_AVAILABLE:
             return None
         try:
-            payload = {"prompt": workflow, "client_id": self.client_id}
-            r = requests.post(f"{self.base_url}/prompt", json=payload, timeout=30)
+            payload = {"prompt": workflow, "client_id": client_id or self.client_id}
+            body = _dumps(payload)
+            headers = {"Content-Type": "application/json"}
+            if len(body) >= GZIP_MIN_BYTES:
+                body = gzip.compress(body, compresslevel=5)
+                headers["Content-Encoding"] = "gzip"
+            r = self._retry(self._http.post, f"{self.base_url}/prompt", data=body, timeout=30,
+                            headers=headers, retry_if=self._not_sent)
             r.raise_for_status()
-            return r.json().get("prompt_id")
+            return _loads(r.content).get("prompt_id")
         except Exception as e:
             logger.error("ComfyUI queue error: %s", e)
+            self._avail_cached = None  # re-check the server on the next call
             return None
 
-    def _wait_for_completion(self, prompt_id: str, poll_interval: float = 1.0) -> bool:
-        """Poll /history until the prompt_id is done or timeout."""
+    def _wait_for_completion(self, prompt_id: str, poll_interval: float = 1.0, ws=None) -> bool:
+        """Wait on the progress socket, or poll /history, until prompt_id is done or timeout."""
         deadline = time.time() + self.timeout
+        if ws is not None:
+            done = self._wait_ws(ws, prompt_id, deadline)
+            if done is not None:
+                if not done:
+                    logger.warning("ComfyUI timeout waiting for prompt %s", prompt_id)
+                return done
+            # Socket dropped: poll for whatever time is left
         while time.time() < deadline:
             try:
-                r = requests.get(f"{self.base_url}/history/{prompt_id}", timeout=10)
+                r = self._http.get(f"{self.base_url}/history/{prompt_id}", timeout=10)
                 if r.ok:
-                    history = r.json()
+                    history = _loads(r.content)
                     if prompt_id in history:
                         return True
             except Exception:
@@ -319,13 +490,44 @@ class ComfyUIClient:
         logger.warning("ComfyUI timeout waiting for prompt %s", prompt_id)
         return False
 
+    @staticmethod
+    def _wait_ws(ws, prompt_id: str, deadline: float) -> Optional[bool]:
+        """
+        Read progress messages until prompt_id finishes.
+
+        Returns True when done (successfully or not, like /history), False on
+        timeout, None if the socket failed and the caller should poll.
+        """
+        try:
+            while True:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return False
+                ws.settimeout(remaining)
+                msg = ws.recv()
+                if not isinstance(msg, str):
+                    continue  # binary latent previews
+                event = _loads(msg)
+                data = event.get("data") or {}
+                if data.get("prompt_id") != prompt_id:
+                    continue
+                if event.get("type") == "executing" and data.get("node") is None:
+                    return True
+                if event.get("type") == "execution_error":
+                    return True
+        except websocket.WebSocketTimeoutException:
+            return False
+        except Exception as e:
+            logger.debug("ComfyUI websocket dropped, polling instead: %s", e)
+            return None
+
     def _get_output_images(self, prompt_id: str) -> List[Dict]:
         """Retrieve output image info for a completed prompt."""
         try:
-            r = requests.get(f"{self.base_url}/history/{prompt_id}", timeout=10)
+            r = self._http.get(f"{self.base_url}/history/{prompt_id}", timeout=10)
             if not r.ok:
                 return []
-            history = r.json()
+            history = _loads(r.content)
             outputs = history.get(prompt_id, {}).get("outputs", {})
             images = []
             for node_id, node_output in outputs.items():
@@ -344,15 +546,73 @@ class ComfyUIClient:
                 "subfolder": image_info.get("subfolder", ""),
                 "type": image_info.get("type", "output"),
             }
-            r = requests.get(f"{self.base_url}/view", params=params, timeout=30)
-            if r.ok:
+            with self._retry(self._http.get, f"{self.base_url}/view", params=params, timeout=30, stream=True) as r:
+                if not r.ok:
+                    return False
                 save_path.parent.mkdir(parents=True, exist_ok=True)
-                save_path.write_bytes(r.content)
+                # Stream into a side file so a failed transfer never leaves a truncated image
+                part = save_path.with_name(save_path.name + ".part")
+                try:
+                    with open(part, "wb") as f:
+                        for chunk in r.iter_content(DOWNLOAD_CHUNK_SIZE):
+                            f.write(chunk)
+                    os.replace(part, save_path)
+                finally:
+                    if part.exists():
+                        part.unlink()
                 return True
         except Exception as e:
             logger.error("Error downloading image: %s", e)
         return False
 
+    # ──────────────────────────────
+    #  Image cache
+    # ──────────────────────────────
+
+    @staticmethod
+    def _cache_key(positive: str, negative: str, model: str, seed: int) -> str:
+        """Stable hash of everything that determines the default workflow's output."""
+        raw = "|".join((positive, negative, model, str(seed))).encode()
+        return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+    def _load_image_cache(self) -> OrderedDict:
+        """Return the cache index, reading it from disk the first time. Call under the lock."""
+        if self._image_cache is None:
+            try:
+                self._image_cache = OrderedDict(json.loads(IMAGE_CACHE_INDEX.read_text()))
+            except (OSError, ValueError):
+                self._image_cache = OrderedDict()
+        return self._image_cache
+
+    def _cache_get(self, key: str) -> Optional[str]:
+        """Saved path for key, if it is still on disk."""
+        with self._image_cache_lock:
+            cache = self._load_image_cache()
+            path = cache.get(key)
+            if path is None:
+                return None
+            if not os.path.isfile(path):
+                del cache[key]
+                return None
+            cache.move_to_end(key)
+            return path
+
+    def _cache_put(self, key: str, path: str):
+        """Remember key -> path and persist the index."""
+        with self._image_cache_lock:
+            cache = self._load_image_cache()
+            cache[key] = path
+            cache.move_to_end(key)
+            while len(cache) > IMAGE_CACHE_SIZE:
+                cache.popitem(last=False)
+            try:
+                IMAGE_CACHE_INDEX.parent.mkdir(parents=True, exist_ok=True)
+                tmp = IMAGE_CACHE_INDEX.with_suffix(".tmp")
+                tmp.write_text(json.dumps(cache))
+                os.replace(tmp, IMAGE_CACHE_INDEX)
+            except OSError as e:
+                logger.debug("Could not write image cache index: %s", e)
+
     # ──────────────────────────────
     #  Public generation methods
     # ──────────────────────────────
@@ -365,6 +625,7 @@ class ComfyUIClient:
         filename_prefix: str = "cosysim",
         workflow: Optional[Dict] = None,
         seed: int = -1,
+        cache: bool = False,
     ) -> Optional[str]:
         """
         Generate an image via ComfyUI.
@@ -376,6 +637,8 @@ class ComfyUIClient:
             filename_prefix: File name prefix
             workflow: Custom ComfyUI workflow dict (uses default if None)
             seed: Generation seed (-1 for random)
+            cache: Reuse the image from an earlier identical request (default
+                workflow and a fixed seed only; a random seed always generates)
 
         Returns:
             Absolute path to saved image, or None on failure
@@ -389,18 +652,32 @@ class ComfyUIClient:
             return self._create_placeholder_image(save_dir, filename_prefix)
 
         # Use provided workflow or build default
+        cache_key = None
         if workflow is None:
-            workflow = _default_image_workflow(positive_prompt, negative_prompt, seed,
-                                               model=self._get_model_name())
-
-        prompt_id = self._queue_prompt(workflow)
-        if not prompt_id:
-            return self._create_placeholder_image(save_dir, filename_prefix)
+            model = self._get_model_name()
+            if cache and seed != -1:
+                cache_key = self._cache_key(positive_prompt, negative_prompt, model, seed)
+                cached = self._cache_get(cache_key)
+                if cached:
+                    logger.info("ComfyUI cache hit: %s", cached)
+                    return cached
+            workflow = _default_image_workflow(positive_prompt, negative_prompt, seed, model=model)
+
+        # Fresh client id per generation so concurrent calls each get their own socket
+        client_id = uuid.uuid4().hex
+        ws = self._open_ws(client_id)
+        try:
+            prompt_id = self._queue_prompt(workflow, client_id)
+            if not prompt_id:
+                return self._create_placeholder_image(save_dir, filename_prefix)
 
-        logger.info("ComfyUI prompt queued: %s", prompt_id)
+            logger.info("ComfyUI prompt queued: %s", prompt_id)
 
-        if not self._wait_for_completion(prompt_id):
-            return self._create_placeholder_image(save_dir, filename_prefix)
+            if not self._wait_for_completion(prompt_id, ws=ws):
+                return self._create_placeholder_image(save_dir, filename_prefix)
+        finally:
+            if ws is not None:
+                ws.close()
 
         images = self._get_output_images(prompt_id)
         if not images:
@@ -416,10 +693,35 @@ class ComfyUIClient:
 
         if self._download_image(images[0], save_path):
             logger.info("ComfyUI image saved: %s", save_path)
+            if cache_key:
+                self._cache_put(cache_key, str(save_path))
             return str(save_path)
 
         return self._create_placeholder_image(save_dir, filename_prefix)
 
+    def generate_batch(
+        self,
+        prompts: List[Tuple[str, str]],
+        save_dir: Optional[str] = None,
+        filename_prefix: str = "cosysim",
+    ) -> List[Optional[str]]:
+        """
+        Generate several images concurrently.
+
+        Every (positive, negative) pair is queued straight away, so ComfyUI's
+        own queue stays full instead of idling between images.
+
+        Returns:
+            Saved paths (or None) in the same order as prompts
+        """
+        if not prompts:
+            return []
+        with ThreadPoolExecutor(max_workers=min(len(prompts), HTTP_POOL_SIZE)) as pool:
+            return list(pool.map(
+                lambda p: self.generate_image(p[0], p[1], save_dir=save_dir, filename_prefix=filename_prefix),
+                prompts,
+            ))
+
     def generate_character_selfie(
         self,
         appearance: str,
@@ -428,8 +730,9 @@ class ComfyUIClient:
         nsfw: bool = False,
         save_dir: Optional[str] = None,
         extra_prompt: str = "",
+        seed: int = -1,
     ) -> Optional[str]:
-        """High-level helper for character selfie generation."""
+        """High-level helper for character selfie generation; a fixed seed reuses earlier results."""
         positive, negative = PromptBuilder.selfie(
             appearance=appearance,
             mood=mood,
@@ -438,7 +741,8 @@ class ComfyUIClient:
             extra=extra_prompt,
         )
         prefix = f"selfie_{mood}"
-        return self.generate_image(positive, negative, save_dir=save_dir, filename_prefix=prefix)
+        return self.generate_image(positive, negative, save_dir=save_dir, filename_prefix=prefix,
+                                   seed=seed, cache=True)
 
     # ──────────────────────────────
     #  Placeholder (offline mode)
@@ -456,13 +760,7 @@ class ComfyUIClient:
             save_dir_path.mkdir(parents=True, exist_ok=True)
             timestamp = time.strftime("%Y%m%d_%H%M%S")
             path = save_dir_path / f"{prefix}_placeholder_{timestamp}.png"
-
-            # 1×1 grey PNG (minimal valid PNG bytes)
-            PNG_1x1_GREY = base64.b64decode(
-                "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk"
-                "+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
-            )
-            path.write_bytes(PNG_1x1_GREY)
+            path.write_bytes(_PLACEHOLDER_PNG)
             return str(path)
         except Exception as e:
             logger.error("Could not create placeholder: %s", e)
@@ -480,6 +778,7 @@ def get_comfyui_client() -> ComfyUIClient:
     global _comfyui_client
     if _comfyui_client is None:
         _comfyui_client = ComfyUIClient()
+        atexit.register(_comfyui_client.close)
     return _comfyui_client
 
 
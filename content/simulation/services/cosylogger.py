@@ -5,8 +5,10 @@ in a ring-buffer so the phone-scene control panel terminal can stream them.
 """
 import logging
 import threading
+import time
 from collections import deque
-from datetime import datetime
+from itertools import islice
+from typing import NamedTuple
 
 # ── Constants ────────────────────────────────────────────────────────────────
 MAX_RECORDS = 2000          # maximum log lines kept in memory
@@ -23,6 +25,26 @@ LEVELS = {
 }
 
 
+# ── Entry ────────────────────────────────────────────────────────────────────
+class _LogEntry(NamedTuple):
+    """One buffered log line; turned into a dict only when handed to callers."""
+    id: int
+    ts: str
+    level: str
+    logger: str
+    message: str
+    levelno: int  # for filtering only, not sent to callers
+
+    def to_dict(self) -> dict:
+        return {
+            "id":      self.id,
+            "ts":      self.ts,
+            "level":   self.level,
+            "logger":  self.logger,
+            "message": self.message,
+        }
+
+
 # ── Handler ──────────────────────────────────────────────────────────────────
 class _RingHandler(logging.Handler):
     """Thread-safe ring-buffer log handler."""
@@ -32,26 +54,27 @@ class _RingHandler(logging.Handler):
         self._buf: deque = deque(maxlen=maxlen)
         self._lock = threading.Lock()
         self._seq = 0
+        self._sec: tuple = (None, "")  # (whole second, "%H:%M:%S" of it), see _timestamp()
 
     def emit(self, record: logging.LogRecord):
         try:
-            self.format(record)           # populate record.message etc.
-            entry = {
-                "id":      self._next_id(),
-                "ts":      datetime.fromtimestamp(record.created).strftime("%H:%M:%S.%f")[:-3],
-                "level":   record.levelname,
-                "logger":  record.name,
-                "message": record.getMessage(),
-            }
+            ts = self._timestamp(record)
+            message = record.getMessage()
+            # One lock round-trip; numbering and appending together keeps ids
+            # in buffer order, which since_id polling relies on
             with self._lock:
-                self._buf.append(entry)
+                self._seq += 1
+                self._buf.append(_LogEntry(self._seq, ts, record.levelname, record.name, message, record.levelno))
         except Exception:                 # never crash the emitting thread
             self.handleError(record)
 
-    def _next_id(self) -> int:
-        with self._lock:
-            self._seq += 1
-            return self._seq
+    def _timestamp(self, record: logging.LogRecord) -> str:
+        """HH:MM:SS.mmm, formatting the seconds part at most once per second."""
+        sec = int(record.created)
+        cached = self._sec
+        if cached[0] != sec:
+            cached = self._sec = (sec, time.strftime("%H:%M:%S", time.localtime(sec)))
+        return f"{cached[1]}.{int(record.msecs):03d}"
 
     # ── Query ─────────────────────────────────────────────────────────────────
     def get_logs(
@@ -65,14 +88,20 @@ class _RingHandler(logging.Handler):
         entries, and optionally only those with id > *since_id* (for polling).
         """
         min_level = LEVELS.get(level.upper(), logging.DEBUG)
+        out = []
+        # Walk newest-first over just the entries the poller hasn't seen, stopping
+        # once *limit* matches are found. Ids are consecutive in the ring (they
+        # are assigned and appended under one lock), so that count is simply
+        # the distance from since_id to the last id handed out
         with self._lock:
-            snapshot = list(self._buf)
-
-        if since_id:
-            snapshot = [e for e in snapshot if e["id"] > since_id]
-
-        filtered = [e for e in snapshot if LEVELS.get(e["level"], 0) >= min_level]
-        return filtered[-limit:]
+            unseen = max(self._seq - since_id, 0)
+            for e in islice(reversed(self._buf), unseen):
+                if e.levelno >= min_level:
+                    out.append(e)
+                    if len(out) == limit:
+                        break
+        out.reverse()
+        return [e.to_dict() for e in out]
 
     def clear(self):
         with self._lock:
@@ -3,6 +3,7 @@ LLM Service - Connects to LM Studio (or any OpenAI-compatible API)
 Used for all character AI responses in CosySim
 """
 import json
+import os
 import time
 import logging
 from typing import Optional, Dict, List, Generator
@@ -14,10 +15,14 @@ sys.path.insert(0, str(project_root))
 
 try:
     import requests
+    from requests.adapters import HTTPAdapter
     REQUESTS_AVAILABLE = True
 except ImportError:
     REQUESTS_AVAILABLE = False
 
+# Keep-alive connections held open to the LLM backend
+HTTP_POOL_SIZE = 32
+
 logger = logging.getLogger(__name__)
 
 
@@ -32,15 +37,27 @@ class LLMService:
         base_url: str = "http://localhost:1234/v1",
         model: str = None,
         timeout: int = 60,
+        cache_prompt: bool = False,
     ):
         self.base_url = base_url.rstrip("/")
         self.model = model  # If None, auto-detect first available model
         self.timeout = timeout
+        # Ask llama.cpp-style servers to keep the KV cache of the shared prompt prefix
+        # (the persona system prompt) between requests. Opt-in: strict OpenAI-compatible
+        # backends reject unknown request fields
+        self.cache_prompt = cache_prompt
         self._model_cache: Optional[str] = None
         self._connected: Optional[bool] = None
 
         if not REQUESTS_AVAILABLE:
             logger.warning("requests library not installed – LLM service unavailable")
+            self._http = None
+        else:
+            # One pooled session so each turn reuses a warm TCP connection
+            self._http = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=HTTP_POOL_SIZE)
+            self._http.mount("http://", adapter)
+            self._http.mount("https://", adapter)
 
     # ─────────────────────────────────────────────
     #  Connection helpers
@@ -51,7 +68,7 @@ class LLMService:
         if not REQUESTS_AVAILABLE:
             return False
         try:
-            r = requests.get(f"{self.base_url}/models", timeout=4)
+            r = self._http.get(f"{self.base_url}/models", timeout=4)
             self._connected = r.ok
             return r.ok
         except Exception:
@@ -67,7 +84,7 @@ class LLMService:
         if not REQUESTS_AVAILABLE:
             return None
         try:
-            r = requests.get(f"{self.base_url}/models", timeout=4)
+            r = self._http.get(f"{self.base_url}/models", timeout=4)
             if r.ok:
                 data = r.json()
                 models = data.get("data", [])
@@ -124,9 +141,11 @@ class LLMService:
             "max_tokens": max_tokens,
             "stream": False,
         }
+        if self.cache_prompt:
+            payload["cache_prompt"] = True
 
         try:
-            r = requests.post(
+            r = self._http.post(
                 f"{self.base_url}/chat/completions",
                 json=payload,
                 timeout=self.timeout,
@@ -316,7 +335,11 @@ def get_llm_service(base_url: str = "http://localhost:1234/v1") -> LLMService:
     """Return the module-level singleton LLM service."""
     global _llm_service
     if _llm_service is None:
-        _llm_service = LLMService(base_url=base_url)
+        # llama.cpp-backed deployments opt in to prompt-prefix caching (see LLMService)
+        _llm_service = LLMService(
+            base_url=base_url,
+            cache_prompt=os.getenv('COSYSIM_LLM_CACHE_PROMPT') == '1',
+        )
     return _llm_service
 
 
@@ -48,6 +48,7 @@ class MediaGenerator:
         style: str = "realistic",
         nsfw: bool = False,
         extra_prompt: str = "",
+        consistent: bool = False,
     ) -> Optional[str]:
         """
         Generate a selfie image for a character.
@@ -60,10 +61,13 @@ class MediaGenerator:
             style: Photo style (unused – kept for API compat)
             nsfw: Allow NSFW content
             extra_prompt: Additional prompt keywords
+            consistent: Seed from name + description, so the same inputs give
+                the same image (reused from the client's cache after the first)
 
         Returns:
             Path to generated/placeholder image, or None
         """
+        seed = PromptBuilder.stable_seed(character_name, character_description) if consistent else -1
         path = self.client.generate_character_selfie(
             appearance=character_description,
             mood=mood,
@@ -71,6 +75,7 @@ class MediaGenerator:
             nsfw=nsfw,
             save_dir=str(self.image_dir),
             extra_prompt=extra_prompt,
+            seed=seed,
         )
 
         if path:
@@ -248,7 +253,7 @@ if __name__ == "__main__":
                 saved = self.image_gen.save_images(result, output_dir=str(self.media_dir))
                 if saved:
                     # Rename to our format
-                    os.rename(saved[0], filepath)
+                    os.replace(saved[0], filepath)
                     
                     # Create ImageAsset
                     from PIL import Image
@@ -0,0 +1,21 @@
+"""
+Realtime helpers shared by the SocketIO-facing services
+"""
+
+
+def character_room(character_id: str) -> str:
+    """SocketIO room that clients viewing this character are joined to."""
+    return f"char:{character_id}"
+
+
+def run_blocking(socketio, func, *args, **kwargs):
+    """
+    Run a blocking call (e.g. SD image generation) without freezing the hub.
+    
+    Under eventlet the call is moved to a real OS thread via
+    eventlet.tpool; other async modes already run tasks on threads.
+    """
+    if socketio and getattr(socketio, 'async_mode', None) == 'eventlet':
+        from eventlet import tpool
+        return tpool.execute(func, *args, **kwargs)
+    return func(*args, **kwargs)
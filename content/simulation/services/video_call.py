@@ -18,6 +18,7 @@ sys.path.insert(0, str(project_root))
 from content.simulation.database.db import Database
 from content.simulation.services.media_generator import MediaGenerator
 from content.simulation.services.voice_call import VoiceCallHandler
+from content.simulation.services.realtime import character_room
 
 
 class VideoCallHandler:
@@ -56,6 +57,10 @@ class VideoCallHandler:
         # Face states for animation
         self.face_states = ["neutral", "talking", "smiling", "blinking"]
     
+    def _call_room(self) -> Optional[str]:
+        """SocketIO room for the character on the active video call"""
+        return character_room(self.active_video_call["character_id"]) if self.active_video_call else None
+    
     def start_video_call(
         self,
         character_id: str,
@@ -195,7 +200,8 @@ class VideoCallHandler:
                     character_description=char_desc,
                     mood=mood_map[state],
                     setting="video_call",
-                    style="realistic"
+                    style="realistic",
+                    consistent=True  # same face on every call
                 )
                 
                 if face_path:
@@ -267,7 +273,7 @@ class VideoCallHandler:
                     "frame": image_b64,
                     "format": "image/png",
                     "timestamp": time.time()
-                }, broadcast=True)
+                }, to=self._call_room())
         
         except Exception as e:
             print(f"Error sending video frame: {e}")
@@ -280,7 +286,7 @@ class VideoCallHandler:
             if self.socketio:
                 self.socketio.emit('video_toggled', {
                     "enabled": enabled
-                }, broadcast=True)
+                }, to=self._call_room())
     
     def _store_video_call_log(self, call_info: Dict):
         """Store video call log in database"""
@@ -167,7 +167,8 @@ class VideoMessageGenerator:
                 character_description=character_description,
                 mood=mood,
                 setting="video_call",  # Close-up, well-lit
-                style="realistic"
+                style="realistic",
+                consistent=True  # same face in every video message
             )
             
             return face_path
@@ -16,6 +16,7 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from content.simulation.database.db import Database
+from content.simulation.services.realtime import character_room
 
 
 class VoiceCallHandler:
@@ -54,6 +55,10 @@ class VoiceCallHandler:
         # LLM callback for conversation
         self.llm_callback = None
     
+    def _call_room(self) -> Optional[str]:
+        """SocketIO room for the character on the active call"""
+        return character_room(self.active_call["character_id"]) if self.active_call else None
+    
     def set_character_voice(self, prompt_wav_path: str, prompt_text: str = None):
         """Set the character's voice sample"""
         if os.path.exists(prompt_wav_path):
@@ -111,7 +116,7 @@ class VoiceCallHandler:
                 "call_id": call_id,
                 "character_name": character_name,
                 "type": call_type
-            }, broadcast=True)
+            }, to=self._call_room())
         
         print(f"📞 Call started: {call_id} ({call_type})")
         
@@ -133,7 +138,7 @@ class VoiceCallHandler:
         if self.socketio:
             self.socketio.emit('call_answered', {
                 "call_id": call_id
-            }, broadcast=True)
+            }, to=self._call_room())
         
         # Character greeting
         greeting = self._get_call_greeting()
@@ -173,7 +178,7 @@ class VoiceCallHandler:
             self.socketio.emit('call_ended', {
                 "call_id": self.active_call["id"],
                 "duration": duration
-            }, broadcast=True)
+            }, to=self._call_room())
         
         print(f"📞 Call ended: {self.active_call['id']} (duration: {duration:.1f}s)")
         
@@ -279,7 +284,7 @@ class VoiceCallHandler:
                 self.socketio.emit('call_audio', {
                     "type": "text",
                     "text": text
-                }, broadcast=True)
+                }, to=self._call_room())
             return
         
         try:
@@ -313,7 +318,7 @@ class VoiceCallHandler:
                             "type": "audio",
                             "data": audio_bytes,
                             "sample_rate": self.sample_rate
-                        }, broadcast=True)
+                        }, to=self._call_room())
         
         except Exception as e:
             print(f"Error generating speech: {e}")
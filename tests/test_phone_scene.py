@@ -0,0 +1,73 @@
+"""
+Phone scene reply generation
+"""
+import sys
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+phone_scene = pytest.importorskip("content.scenes.phone.phone_scene")
+
+
+class FakeCharacter:
+    id = "char-1"
+    name = "Emma"
+    relationship_level = 0.5
+
+    def __init__(self, history):
+        self._history = history
+
+    def get_conversation_history(self, limit=10):
+        return self._history
+
+    def get_system_prompt(self):
+        return "You are Emma."
+
+    def build_context(self, query):
+        return ""
+
+
+class FakeLLM:
+    timeout = 60
+
+    def chat(self, messages, system_prompt=None):
+        return "Here you go!"
+
+    def parse_intent(self, message):
+        return {"wants_selfie": True}
+
+
+def make_scene(history):
+    scene = phone_scene.PhoneScene.__new__(phone_scene.PhoneScene)
+    scene.active_character = FakeCharacter(history)
+    scene.current_chain_id = "chain-1"
+    scene.settings = {}
+    scene._cancel_event = threading.Event()
+    scene.gallery = SimpleNamespace(random_media_id=lambda *args, **kwargs: "media-1")
+    scene.socketio = SimpleNamespace(emit=lambda *args, **kwargs: None)
+    return scene
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("history", [
+    [],
+    [{"messages": [
+        {"role": "user", "content": "Hi!"},
+        {"role": "assistant", "content": "Hey you"},
+    ]}],
+])
+def test_selfie_note_joins_turn(monkeypatch, history):
+    """The photo note lands in the turn, with or without earlier messages"""
+    monkeypatch.setattr(phone_scene, "get_llm_service", lambda: FakeLLM())
+    scene = make_scene(history)
+    turn = []
+
+    response = scene._generate_response("Send me a selfie", turn)
+
+    assert response == "Here you go!"
+    assert [entry["content"] for entry in turn] == ["[Photo sent: media-1]"]